@@ -0,0 +1,34 @@
+import os
+
+# Must run before any PySide6 import so Qt picks the headless platform plugin.
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import pytest
+from PySide6.QtCore import QCoreApplication
+
+from fakes import FakePlayer
+from videomleditor.player_controller import VideoPlayerController
+
+
+@pytest.fixture(scope="session")
+def qcore_app():
+    """Ensure a Qt application exists for QObject/SIGNAL plumbing during tests."""
+    app = getattr(pytest, "qapp", None)
+    if app is None:
+        app = QCoreApplication.instance() or QCoreApplication([])
+        pytest.qapp = app
+    assert QCoreApplication.instance() is app
+    yield app
+
+
+@pytest.fixture
+def controller_and_player(qcore_app, tmp_path):
+    """Fresh controller/fake player pair, so no signal spy or frame rate leaks between tests."""
+    player = FakePlayer()
+    # Keep the metadata cache out of the developer's home directory
+    meta_cache = tmp_path / "meta.json"
+    controller = VideoPlayerController(
+        player_factory=lambda _parent, _player=player: _player,
+        meta_cache_path=meta_cache,
+    )
+    return controller, player
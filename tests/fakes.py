@@ -0,0 +1,113 @@
+from collections import deque
+
+from PySide6.QtMultimedia import QMediaPlayer
+
+_PLAYING = QMediaPlayer.PlayingState
+
+
+class FakeSignal:
+    """Minimal Qt-like signal for driving controller wiring in tests."""
+
+    __slots__ = ("_subscribers",)
+
+    def __init__(self):
+        self._subscribers = deque()
+
+    def connect(self, callback):
+        self._subscribers.append(callback)
+
+    def emit(self, *args, **kwargs):
+        """Call every subscriber in connection order; callbacks must not connect during emit."""
+        for callback in self._subscribers:
+            callback(*args, **kwargs)
+
+
+class FakeMetaData:
+    __slots__ = ("_frame_rate",)
+
+    def __init__(self, frame_rate=None):
+        self._frame_rate = frame_rate
+
+    def value(self, _key):
+        return self._frame_rate
+
+
+class FakePlayer:
+    """Stub for QMediaPlayer interactions used by VideoPlayerController."""
+
+    __slots__ = (
+        "_position",
+        "_duration",
+        "positionChanged",
+        "durationChanged",
+        "playbackStateChanged",
+        "mediaStatusChanged",
+        "errorOccurred",
+        "_frame_rate",
+        "_metadata",
+        "video_output",
+        "source",
+    )
+
+    def __init__(self, position=0, duration=1000, frame_rate=None):
+        self._position = position
+        self._duration = duration
+        self.positionChanged = FakeSignal()
+        self.durationChanged = FakeSignal()
+        self.playbackStateChanged = FakeSignal()
+        self.mediaStatusChanged = FakeSignal()
+        self.errorOccurred = FakeSignal()
+        self._frame_rate = frame_rate
+        self._metadata = FakeMetaData(frame_rate)
+        self.video_output = None
+        self.source = None
+
+    def set_frame_rate(self, frame_rate):
+        self._frame_rate = frame_rate
+        self._metadata._frame_rate = frame_rate
+
+    def setAudioOutput(self, _output):
+        return None
+
+    def setVideoOutput(self, output):
+        self.video_output = output
+
+    def setSource(self, source):
+        self.source = source
+
+    def play(self):
+        return None
+
+    def pause(self):
+        return None
+
+    def duration(self):
+        return self._duration
+
+    def set_duration(self, value):
+        self._duration = value
+        self.durationChanged.emit(value)
+
+    def set_position(self, value):
+        """Move the fake playhead and notify like a real player tick."""
+        self._position = value
+        self.positionChanged.emit(value)
+
+    def position(self):
+        return self._position
+
+    def setPosition(self, value):
+        self._position = value
+
+    def playbackState(self):
+        return _PLAYING
+
+    def metaData(self):
+        return self._metadata
+
+
+def spy_on(signal):
+    """Record every emission of ``signal`` as a tuple of its arguments."""
+    received = []
+    signal.connect(lambda *args: received.append(args))
+    return received
@@ -1,139 +1,125 @@
-import os
+import json
 
 import pytest
-from PySide6.QtCore import QCoreApplication
 from PySide6.QtMultimedia import QMediaPlayer
-from PySide6.QtTest import QSignalSpy
 
-from videomleditor.player_controller import VideoPlayerController
+from fakes import FakePlayer, spy_on
+from videomleditor import player_controller
+from videomleditor.player_controller import VideoPlayerController, _meta_writer
 
+_BUFFERED = QMediaPlayer.BufferedMedia
+_LOADED = QMediaPlayer.LoadedMedia
 
-@pytest.fixture(scope="session", autouse=True)
-def qcore_app():
-    """Ensure a Qt application exists for QObject/SIGNAL plumbing during tests."""
-    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
-    app = QCoreApplication.instance()
-    if app is None:
-        app = QCoreApplication([])
-    yield app
 
+@pytest.fixture
+def player_with_fps(controller_and_player, request):
+    """Pair whose metadata reports ``request.param`` fps (missing by default)."""
+    controller, player = controller_and_player
+    player.set_frame_rate(getattr(request, "param", None))
+    return controller, player
 
-class FakeSignal:
-    """Minimal Qt-like signal for driving controller wiring in tests."""
 
-    def __init__(self):
-        self._subscribers = []
+@pytest.mark.parametrize(
+    "pos,dur,delta,expected",
+    [
+        (0, 1000, 1, 33),  # 1000/30 ~= 33ms per frame
+        (10, 1000, -1, 0),  # clamped to zero
+        (980, 1000, 2, 1000),  # ~66ms forward, should cap at duration
+    ],
+)
+def test_skip_frames(player_with_fps, pos, dur, delta, expected):
+    controller, player = player_with_fps
+    # Buffering first: the first-frame play/pause it triggers seeks back to 0
+    player.mediaStatusChanged.emit(_BUFFERED)
+    player.set_position(pos)
+    player.set_duration(dur)
 
-    def connect(self, callback):
-        self._subscribers.append(callback)
+    controller.skip_frames(delta)
+    assert player._position == expected
 
-    def emit(self, *args, **kwargs):
-        for callback in list(self._subscribers):
-            callback(*args, **kwargs)
 
+@pytest.mark.parametrize("player_with_fps", [60], indirect=True)
+def test_frame_rate_metadata_updates_interval(player_with_fps):
+    controller, player = player_with_fps
+    player.set_position(0)
+    player.set_duration(1000)
 
-class FakeMetaData:
-    def __init__(self, frame_rate=None):
-        self._frame_rate = frame_rate
-
-    def value(self, _key):
-        return self._frame_rate
-
-
-class FakePlayer:
-    """Stub for QMediaPlayer interactions used by VideoPlayerController."""
-
-    def __init__(self, position=0, duration=1000, frame_rate=None):
-        self._position = position
-        self._duration = duration
-        self.positionChanged = FakeSignal()
-        self.durationChanged = FakeSignal()
-        self.playbackStateChanged = FakeSignal()
-        self.mediaStatusChanged = FakeSignal()
-        self.errorOccurred = FakeSignal()
-        self._frame_rate = frame_rate
-        self.video_output = None
-        self.source = None
-
-    def setAudioOutput(self, _output):
-        return None
-
-    def setVideoOutput(self, output):
-        self.video_output = output
-
-    def setSource(self, source):
-        self.source = source
-
-    def play(self):
-        return None
-
-    def pause(self):
-        return None
-
-    def duration(self):
-        return self._duration
-
-    def position(self):
-        return self._position
-
-    def setPosition(self, value):
-        self._position = value
-
-    def playbackState(self):
-        return QMediaPlayer.PlayingState
-
-    def metaData(self):
-        return FakeMetaData(self._frame_rate)
-
-
-def build_controller(fake_player: FakePlayer) -> VideoPlayerController:
-    return VideoPlayerController(player_factory=lambda parent: fake_player)
-
-
-def test_skip_frames_forward_and_backward():
-    player = FakePlayer(position=0, duration=1000)
-    controller = build_controller(player)
-
+    player.mediaStatusChanged.emit(_BUFFERED)
     controller.skip_frames(1)
-    assert player.position() == 33  # 1000/30 ~= 33ms per frame
-
-    player.setPosition(10)
-    controller.skip_frames(-1)
-    assert player.position() == 0  # clamped to zero
-
 
-def test_skip_frames_respects_duration_cap():
-    player = FakePlayer(position=980, duration=1000)
-    controller = build_controller(player)
+    assert player._position == 16  # 1000/60 ~= 16ms per frame
 
-    controller.skip_frames(2)  # ~66ms forward, should cap at duration
-    assert player.position() == 1000
 
-
-def test_frame_rate_metadata_updates_interval():
-    player = FakePlayer(position=0, duration=1000, frame_rate=60)
-    controller = build_controller(player)
-
-    controller._handle_media_status(QMediaPlayer.BufferedMedia)
+@pytest.mark.parametrize("player_with_fps", [25], indirect=True)
+def test_frame_rate_change_refreshes_cached_steps(player_with_fps):
+    controller, player = player_with_fps
+    player.set_position(0)
+    player.set_duration(1000)
+    player.mediaStatusChanged.emit(_BUFFERED)
     controller.skip_frames(1)
+    assert player._position == 40
 
-    assert player.position() == 16  # 1000/60 ~= 16ms per frame
-
-
-def test_error_emits_message_signal():
-    player = FakePlayer()
-    controller = build_controller(player)
-    spy = QSignalSpy(controller.error_occurred)
-
-    controller._handle_error(QMediaPlayer.ResourceError, "boom")
-    assert spy.count() == 1
-    assert spy.takeFirst()[0] == "boom"
+    player.set_frame_rate(50)
+    player.mediaStatusChanged.emit(_BUFFERED)
+    player.set_position(0)
+    controller.skip_frames(1)
+    assert player._position == 20
 
 
-def test_no_error_does_not_emit():
-    player = FakePlayer()
-    controller = build_controller(player)
-    spy = QSignalSpy(controller.error_occurred)
+def test_load_forgets_previous_duration_and_position(controller_and_player, tmp_path):
+    controller, player = controller_and_player
+    player.set_duration(1000)
+    player.set_position(500)
 
-    controller._handle_error(QMediaPlayer.NoError, "")
-    assert spy.count() == 0
+    controller.load(tmp_path / "next.mp4")
+    controller.skip_frames(1)
+    assert player._position == 500  # no seek until the new file reports a duration
+
+
+def test_frame_rate_cache_round_trip(qcore_app, tmp_path):
+    video = tmp_path / "clip.mp4"
+    video.write_bytes(b"\0")
+    cache = tmp_path / "meta.json"
+
+    player = FakePlayer(frame_rate=25)
+    first = VideoPlayerController(player_factory=lambda _parent: player, meta_cache_path=cache)
+    first.load(video)
+    player.mediaStatusChanged.emit(_LOADED)
+    _meta_writer().waitForDone()
+    assert list(json.loads(cache.read_text()).values()) == [{"fps": 25.0}]
+    assert list(tmp_path.glob("*.tmp")) == []  # written via a temp file and os.replace
+
+    second = VideoPlayerController(player_factory=lambda _parent: FakePlayer(), meta_cache_path=cache)
+    received = spy_on(second.frame_rate_changed)
+    second.load(video)
+    assert received == [(25.0,)]
+
+
+def test_fallback_frame_rate_is_not_cached(qcore_app, tmp_path):
+    video = tmp_path / "clip.mp4"
+    video.write_bytes(b"\0")
+    cache = tmp_path / "meta.json"
+
+    player = FakePlayer()  # no frame rate in the metadata
+    controller = VideoPlayerController(player_factory=lambda _parent: player, meta_cache_path=cache)
+    controller.load(video)
+    player.mediaStatusChanged.emit(_LOADED)
+    _meta_writer().waitForDone()
+    assert not cache.exists()
+
+
+def test_frame_rate_cache_is_bounded_and_hashed(qcore_app, tmp_path, monkeypatch):
+    monkeypatch.setattr(player_controller, "_META_CACHE_LIMIT", 2)
+    cache = tmp_path / "meta.json"
+    player = FakePlayer(frame_rate=25)
+    controller = VideoPlayerController(player_factory=lambda _parent: player, meta_cache_path=cache)
+    for name in ("a.mp4", "b.mp4", "c.mp4"):
+        video = tmp_path / name
+        video.write_bytes(b"\0")
+        controller.load(video)
+        player.mediaStatusChanged.emit(_LOADED)
+    _meta_writer().waitForDone()
+
+    text = cache.read_text()
+    assert len(json.loads(text)) == 2  # the least recently opened file was dropped
+    assert str(tmp_path) not in text
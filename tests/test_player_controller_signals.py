@@ -0,0 +1,59 @@
+from PySide6.QtMultimedia import QMediaPlayer
+
+from fakes import spy_on
+
+_RES_ERR = QMediaPlayer.ResourceError
+_NO_ERR = QMediaPlayer.NoError
+
+
+def test_error_emits_message_signal(controller_and_player):
+    controller, player = controller_and_player
+    received = spy_on(controller.error_occurred)
+
+    player.errorOccurred.emit(_RES_ERR, "boom")
+    assert len(received) == 1
+    assert received[0][0] == "boom"
+
+
+def test_no_error_does_not_emit(controller_and_player):
+    controller, player = controller_and_player
+    received = spy_on(controller.error_occurred)
+
+    player.errorOccurred.emit(_NO_ERR, "")
+    assert received == []
+
+
+def test_error_members_are_compared_without_int(controller_and_player):
+    # QMediaPlayer.Error is a plain Enum in current PySide6; int() on a member raises
+    from videomleditor import player_controller
+
+    assert player_controller._NO_ERROR is QMediaPlayer.Error.NoError
+    controller, player = controller_and_player
+    received = spy_on(controller.error_occurred)
+
+    player.errorOccurred.emit(QMediaPlayer.Error.FormatError, "")
+    player.errorOccurred.emit(QMediaPlayer.Error.NoError, "")
+    assert received == [("Erro ao carregar o vídeo.",)]
+
+
+def test_position_updates_are_coalesced(controller_and_player):
+    controller, player = controller_and_player
+    received = spy_on(controller.position_changed)
+
+    player.positionChanged.emit(10)
+    player.positionChanged.emit(20)
+    assert received == []
+
+    controller._position_timer.stop()
+    controller._flush_position()
+    assert received == [(20,)]
+
+
+def test_load_drops_pending_position(controller_and_player, tmp_path):
+    controller, player = controller_and_player
+    received = spy_on(controller.position_changed)
+
+    player.positionChanged.emit(900)
+    controller.load(tmp_path / "next.mp4")
+    assert not controller._position_timer.isActive()
+    assert received == []
@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import ClassVar, Union
+
+from PySide6.QtGui import QColor
+
+
+# Records compare and hash by identity, so list.remove() and `in` match the exact
+# instance shown in the tree rather than any annotation with equal fields.
+@dataclass(slots=True, eq=False)
+class PointAnnotation:
+    """A single marker at video coordinates (x, y)."""
+
+    type: ClassVar[str] = "point"
+
+    x: float
+    y: float
+    size: int
+    color: QColor
+    id: int
+    name: str | None = None
+
+
+@dataclass(slots=True, eq=False)
+class LineAnnotation:
+    """A segment from (x1, y1) to (x2, y2)."""
+
+    type: ClassVar[str] = "line"
+
+    x1: float
+    y1: float
+    x2: float
+    y2: float
+    width: int
+    color: QColor
+    id: int
+    name: str | None = None
+
+
+@dataclass(slots=True, eq=False)
+class AngleAnnotation:
+    """Two segments meeting at the vertex (x2, y2); ``angle`` is in degrees."""
+
+    type: ClassVar[str] = "angle"
+
+    x1: float
+    y1: float
+    x2: float
+    y2: float
+    x3: float
+    y3: float
+    angle: float
+    width: int
+    color: QColor
+    id: int
+    name: str | None = None
+
+
+Annotation = Union[PointAnnotation, LineAnnotation, AngleAnnotation]
@@ -2,7 +2,6 @@ from __future__ import annotations
 
 import sys
 
-from PySide6.QtCore import Qt
 from PySide6.QtWidgets import QApplication
 
 from .main_window import MainWindow
@@ -10,8 +9,8 @@ from .main_window import MainWindow
 
 def run() -> int:
     """Start the VideoML Editor application."""
-    QApplication.setAttribute(Qt.AA_EnableHighDpiScaling, True)
-    app = QApplication(sys.argv)
+    # The editor takes no command-line options; only the program name is forwarded to Qt.
+    app = QApplication(sys.argv[:1])
 
     window = MainWindow()
     window.show()
@@ -1,10 +1,15 @@
 from __future__ import annotations
 
+from collections.abc import Callable
 from pathlib import Path
+import array
+import bisect
 import math
+import os
+import time
 
-from PySide6.QtCore import Qt, QSize, QEvent
-from PySide6.QtGui import QAction, QIcon, QKeySequence, QShortcut, QPainterPath, QImage, QPainter, QColor, QTransform
+from PySide6.QtCore import Qt, QEvent, QSize, QTimer
+from PySide6.QtGui import QAction, QIcon, QKeySequence, QShortcut, QPainterPath, QImage, QPainter, QPixmap, QColor, QFont, QTransform
 from PySide6.QtMultimedia import QMediaPlayer
 from PySide6.QtWidgets import (
     QFileDialog,
@@ -20,7 +25,6 @@ from PySide6.QtWidgets import (
     QWidget,
     QTreeWidget,
     QTreeWidgetItem,
-    QPlainTextEdit,
     QFrame,
     QButtonGroup,
     QInputDialog,
@@ -30,9 +34,13 @@ from PySide6.QtWidgets import (
     QColorDialog,
 )
 
+from .annotations import AngleAnnotation, Annotation, LineAnnotation, PointAnnotation
 from .player_controller import VideoPlayerController
 from .video_view import VideoView
 
+_SUPPORTED_SUFFIXES = frozenset({".mp4", ".avi"})
+_TREE_SYMBOLS = {"point": "●", "line": "╱", "angle": "∠", "freehand": "◌", "brush": "🖌", "mask": "▣"}
+
 
 class MainWindow(QMainWindow):
     def __init__(self) -> None:
@@ -42,13 +50,66 @@ class MainWindow(QMainWindow):
 
         self._player_controller = VideoPlayerController(self)
         self._slider_is_active = False
+        # Python-side mirrors of widget state read on hot paths
+        self._looping = False
+        self._active_tool = "selection"
+        # Coalesce slider-driven seeks so a drag issues ~25 seeks/s instead of one per pixel
+        self._pending_seek_ms: int | None = None
+        self._hidden_position_ms: int | None = None  # Last position seen while not visible
+        self._pending_load_path: Path | None = None  # Set until _finalize_load runs
+        # Accept/ignore decision for the drag in progress, made on DragEnter
+        self._drag_accepted = False
+        # The time label is refreshed at most ~10 times per second during playback
+        self._last_position_ms = 0
+        self._last_time_label_ns = 0
+        # Memoized pieces of the time label text
+        self._timestamp_seconds = 0
+        self._timestamp_prefix = "00:00"
+        self._duration_text_ms = 0
+        self._duration_text = "00:00.000"
+        self._time_label_key: tuple[int, int] | None = None  # (position, duration) last shown
+        self._seek_debounce = QTimer(self)
+        self._seek_debounce.setSingleShot(True)
+        self._seek_debounce.setInterval(40)
+        self._seek_debounce.timeout.connect(self._flush_pending_seek)
         self._media_loaded = False
         self._frame_rate = 30.0
+        self._ms_per_frame = 1000.0 / 30.0  # Cached from _frame_rate for per-tick frame math
         self._current_frame = 0
+        self._properties_text = ""  # Mirrors the _prop_view label text
+        self._label_texts: dict[QLabel, str] = {}  # Last text written by _set_label_text
+        # Last states applied by _update_controls_enabled / _update_interest_actions_enabled
+        self._controls_enabled: bool | None = None
+        self._interest_actions_enabled: bool | None = None
         self._shortcuts: dict[str, QShortcut] = {}
+        self._shortcut_handlers: dict[str, Callable[[], None]] = {
+            "toggle_play_pause": self._toggle_play_pause,
+            "frame_forward": self._step_forward,
+            "frame_back": self._step_back,
+        }
+        self._icon_cache: dict[QStyle.StandardPixmap, QIcon] = {}
+        self._symbol_icons: dict[tuple[int, str], QIcon] = {}  # (rgba, type) -> tree row icon
+        # Tree row fonts indexed by "is named", shared by every row
+        bold_font = QFont()
+        bold_font.setBold(True)
+        self._row_fonts = (QFont(), bold_font)
         self._fit_pending = False
-        self._saved_frames: list[dict[str, int | str | None]] = []
+        # Saved frames as parallel arrays, kept sorted by frame number
+        self._frame_values = array.array("i")
+        self._frame_names: list[str | None] = []
         self._tree_root: QTreeWidgetItem | None = None
+        self._frame_items: dict[int, QTreeWidgetItem] = {}
+        # Annotation/mask rows per frame, keyed by (type, id)
+        self._child_items: dict[int, dict[tuple[str, int], QTreeWidgetItem]] = {}
+        self._pending_tree_frames: set[int] = set()  # Rows awaiting _flush_tree_updates
+        self._stale_tree_frames: set[int] = set()  # Collapsed rows whose children lag the data
+        self._color_intern: dict[int, QColor] = {}  # rgba -> shared annotation color
+        # Per-frame overlay revisions, and the (frame, revision) last sent to the video view
+        self._overlay_revs: dict[int, int] = {}
+        self._pushed_overlay: tuple[int, int] | None = None
+        # Tool configuration menus, built on first right-click: key -> (menu, sync widgets)
+        self._tool_menus: dict[str, tuple[QMenu, Callable[[], None]]] = {}
+        self._color_dialog: QColorDialog | None = None
         
         # Point tool settings
         self._point_size: int = 3
@@ -72,8 +133,8 @@ class MainWindow(QMainWindow):
         self._brush_color: QColor = QColor("yellow")
         self._brush_diameter: int = 5
 
-        # Annotations storage: {frame_number: [{"type": "point", ...}, ...]}
-        self._annotations: dict[int, list[dict]] = {}
+        # frame -> {(type, id): annotation}, in creation order
+        self._annotations: dict[int, dict[tuple[str, int], Annotation]] = {}
         self._annotation_counter: dict[str, int] = {"point": 0, "line": 0, "angle": 0, "freehand": 0, "brush": 0}
 
         # Masks storage: {frame_number: {"type": "mask", "path": QPainterPath, "width": int, "color": QColor, "name": str | None, "id": int}}
@@ -92,13 +153,18 @@ class MainWindow(QMainWindow):
     def _build_actions(self) -> None:
         self._open_action = QAction("Abrir vídeo...", self)
         self._open_action.setShortcut("Ctrl+O")
-        self._open_action.setIcon(self.style().standardIcon(QStyle.SP_DirOpenIcon))
+        self._open_action.setIcon(self._icon_for_style(QStyle.SP_DirOpenIcon))
+        self._icon_play = self._icon_for_style(QStyle.SP_MediaPlay)
+        self._icon_pause = self._icon_for_style(QStyle.SP_MediaPause)
+        self._play_btn_shows_pause = False
 
         file_menu = self.menuBar().addMenu("Arquivo")
         file_menu.addAction(self._open_action)
 
     def _build_ui(self) -> None:
         central = QWidget(self)
+        # Children inherit this as they are laid out; re-enabled once the tree is assembled
+        central.setUpdatesEnabled(False)
         main_layout = QHBoxLayout(central)
         main_layout.setContentsMargins(12, 12, 12, 12)
         main_layout.setSpacing(8)
@@ -125,7 +191,7 @@ class MainWindow(QMainWindow):
         self._frames_tree.customContextMenuRequested.connect(self._show_tree_context_menu)
         self._tree_root = QTreeWidgetItem(["Frames"])
         self._frames_tree.addTopLevelItem(self._tree_root)
-        self._frames_tree.expandAll()
+        self._tree_root.setExpanded(True)
         left_panel.addLayout(left_header)
         left_panel.addWidget(self._frames_tree, stretch=1)
 
@@ -147,55 +213,27 @@ class MainWindow(QMainWindow):
         # Tool bar row (selection + hand + geometry tools)
         tool_row = QHBoxLayout()
         tool_row.setSpacing(6)
-        self._selection_btn = QPushButton("🖱", self)
-        self._selection_btn.setCheckable(True)
-        self._selection_btn.setToolTip("Seleção (cursor)")
-        self._hand_btn = QPushButton("✋", self)
-        self._hand_btn.setCheckable(True)
-        self._hand_btn.setToolTip("Mover o vídeo quando houver zoom")
+        self._selection_btn = self._make_tool_button("🖱", "Seleção (cursor)")
+        self._hand_btn = self._make_tool_button("✋", "Mover o vídeo quando houver zoom")
 
         # Geometry tools
-        self._point_btn = QPushButton("●", self)
-        self._point_btn.setCheckable(True)
-        self._point_btn.setToolTip("Desenhar ponto (clique direito para configurar)")
-        self._point_btn.setContextMenuPolicy(Qt.CustomContextMenu)
-        self._point_btn.customContextMenuRequested.connect(self._show_point_context_menu)
-        
-        self._line_btn = QPushButton("╱", self)
-        self._line_btn.setCheckable(True)
-        self._line_btn.setToolTip("Desenhar reta (clique direito para configurar)")
-        self._line_btn.setContextMenuPolicy(Qt.CustomContextMenu)
-        self._line_btn.customContextMenuRequested.connect(self._show_line_context_menu)
-        
-        self._angle_btn = QPushButton("∠", self)
-        self._angle_btn.setCheckable(True)
-        self._angle_btn.setToolTip("Desenhar ângulo (clique direito para configurar)\nSegure Shift para ângulo de 90°")
-        self._angle_btn.setContextMenuPolicy(Qt.CustomContextMenu)
-        self._angle_btn.customContextMenuRequested.connect(self._show_angle_context_menu)
-        
-        self._freehand_btn = QPushButton("◌", self)
-        self._freehand_btn.setCheckable(True)
-        self._freehand_btn.setToolTip("Máscara free hand (clique direito para configurar)")
-        self._freehand_btn.setContextMenuPolicy(Qt.CustomContextMenu)
-        self._freehand_btn.customContextMenuRequested.connect(self._show_freehand_context_menu)
-        
-        self._brush_btn = QPushButton("🖌", self)
-        self._brush_btn.setCheckable(True)
-        self._brush_btn.setToolTip("Brush (clique direito para configurar)")
-        self._brush_btn.setContextMenuPolicy(Qt.CustomContextMenu)
-        self._brush_btn.customContextMenuRequested.connect(self._show_brush_context_menu)
-
-        for button in (
-            self._selection_btn,
-            self._hand_btn,
-            self._point_btn,
-            self._line_btn,
-            self._angle_btn,
-            self._freehand_btn,
-            self._brush_btn,
-        ):
-            button.setIconSize(QSize(20, 20))
-            button.setMaximumWidth(36)
+        self._point_btn = self._make_tool_button(
+            "●", "Desenhar ponto (clique direito para configurar)", self._show_point_context_menu
+        )
+        self._line_btn = self._make_tool_button(
+            "╱", "Desenhar reta (clique direito para configurar)", self._show_line_context_menu
+        )
+        self._angle_btn = self._make_tool_button(
+            "∠",
+            "Desenhar ângulo (clique direito para configurar)\nSegure Shift para ângulo de 90°",
+            self._show_angle_context_menu,
+        )
+        self._freehand_btn = self._make_tool_button(
+            "◌", "Máscara free hand (clique direito para configurar)", self._show_freehand_context_menu
+        )
+        self._brush_btn = self._make_tool_button(
+            "🖌", "Brush (clique direito para configurar)", self._show_brush_context_menu
+        )
 
         self._tool_group = QButtonGroup(self)
         self._tool_group.setExclusive(True)
@@ -246,7 +284,6 @@ class MainWindow(QMainWindow):
         # Video view
         self._video_view = VideoView(self)
         self._video_view.setAcceptDrops(True)
-        self._video_view.installEventFilter(self)
         center_panel.addWidget(self._video_view, stretch=1)
 
         # Timeline slider row
@@ -265,7 +302,7 @@ class MainWindow(QMainWindow):
         self._loop_checkbox.setToolTip("Repetir vídeo ao finalizar")
         self._start_btn = QPushButton(self._icon_for_style(QStyle.SP_MediaSkipBackward), "", self)
         self._back_frame_btn = QPushButton(self._icon_for_style(QStyle.SP_MediaSeekBackward), "", self)
-        self._play_btn = QPushButton(self._icon_for_style(QStyle.SP_MediaPlay), "", self)
+        self._play_btn = QPushButton(self._icon_play, "", self)
         self._forward_frame_btn = QPushButton(self._icon_for_style(QStyle.SP_MediaSeekForward), "", self)
         self._end_btn = QPushButton(self._icon_for_style(QStyle.SP_MediaSkipForward), "", self)
         self._save_frame_btn = QPushButton(self._icon_for_style(QStyle.SP_DialogSaveButton), "Salvar frame", self)
@@ -305,9 +342,12 @@ class MainWindow(QMainWindow):
         right_panel = QVBoxLayout()
         right_panel.setSpacing(6)
         prop_label = QLabel("Propriedades", self)
-        self._prop_view = QPlainTextEdit(self)
-        self._prop_view.setReadOnly(True)
+        self._prop_view = QLabel(self)
         self._prop_view.setFrameShape(QFrame.StyledPanel)
+        self._prop_view.setTextFormat(Qt.PlainText)
+        self._prop_view.setAlignment(Qt.AlignTop | Qt.AlignLeft)
+        self._prop_view.setWordWrap(True)
+        self._prop_view.setTextInteractionFlags(Qt.TextSelectableByMouse)
         right_panel.addWidget(prop_label)
         right_panel.addWidget(self._prop_view, stretch=1)
 
@@ -317,13 +357,30 @@ class MainWindow(QMainWindow):
         main_layout.addLayout(right_panel, stretch=3)
 
         self.setCentralWidget(central)
+        central.setUpdatesEnabled(True)
         self.setStatusBar(self.statusBar())
 
         self._player_controller.set_video_output(self._video_view.video_item)
         self._update_properties("Nenhum item selecionado")
 
+    def _make_tool_button(self, glyph: str, tooltip: str, menu_slot=None) -> QPushButton:
+        """Create a checkable tool-row button, optionally with a right-click config menu."""
+        button = QPushButton(glyph, self)
+        button.setCheckable(True)
+        button.setToolTip(tooltip)
+        button.setIconSize(QSize(20, 20))
+        button.setMaximumWidth(36)
+        if menu_slot is not None:
+            button.setContextMenuPolicy(Qt.CustomContextMenu)
+            button.customContextMenuRequested.connect(menu_slot)
+        return button
+
     def _icon_for_style(self, style_constant: QStyle.StandardPixmap) -> QIcon:
-        return self.style().standardIcon(style_constant)
+        icon = self._icon_cache.get(style_constant)
+        if icon is None:
+            icon = self.style().standardIcon(style_constant)
+            self._icon_cache[style_constant] = icon
+        return icon
 
     # endregion
 
@@ -332,18 +389,23 @@ class MainWindow(QMainWindow):
         self._open_action.triggered.connect(self._open_file_dialog)
         self._open_btn.clicked.connect(self._open_file_dialog)
 
-        self._start_btn.clicked.connect(lambda: self._player_controller.set_position(0))
-        self._back_frame_btn.clicked.connect(lambda: self._player_controller.skip_frames(-1))
-        self._forward_frame_btn.clicked.connect(lambda: self._player_controller.skip_frames(1))
+        self._start_btn.clicked.connect(self._seek_to_start)
+        self._back_frame_btn.clicked.connect(self._step_back)
+        self._forward_frame_btn.clicked.connect(self._step_forward)
         self._end_btn.clicked.connect(self._seek_to_end)
         self._play_btn.clicked.connect(self._toggle_play_pause)
-        self._hand_btn.toggled.connect(self._on_hand_toggled)
-        self._selection_btn.toggled.connect(self._on_selection_toggled)
-        self._point_btn.toggled.connect(self._on_point_toggled)
-        self._line_btn.toggled.connect(self._on_line_toggled)
-        self._angle_btn.toggled.connect(self._on_angle_toggled)
-        self._freehand_btn.toggled.connect(self._on_freehand_toggled)
-        self._brush_btn.toggled.connect(self._on_brush_toggled)
+        # One dispatcher for the whole tool group instead of a toggled slot per button
+        group = self._tool_group
+        self._tool_enter_handlers: dict[int, Callable[[], None]] = {
+            group.id(self._selection_btn): self._enter_selection_tool,
+            group.id(self._hand_btn): self._enter_hand_tool,
+            group.id(self._point_btn): self._enter_point_tool,
+            group.id(self._line_btn): self._enter_line_tool,
+            group.id(self._angle_btn): self._enter_angle_tool,
+            group.id(self._freehand_btn): self._enter_freehand_tool,
+            group.id(self._brush_btn): self._enter_brush_tool,
+        }
+        group.idToggled.connect(self._on_tool_toggled)
 
         # Video view line completion
         self._video_view.line_completed.connect(self._on_line_completed)
@@ -356,12 +418,18 @@ class MainWindow(QMainWindow):
         self._video_view.freehand_completed.connect(self._on_freehand_completed)
         self._video_view.brush_stroke_completed.connect(self._on_brush_stroke_completed)
         
-        self._loop_checkbox.toggled.connect(self._player_controller.set_looping)
+        self._loop_checkbox.toggled.connect(self._set_looping)
         self._save_frame_btn.clicked.connect(self._save_current_frame)
         self._frames_tree.itemClicked.connect(self._on_tree_item_clicked)
+        self._frames_tree.itemExpanded.connect(self._on_tree_item_expanded)
         self._edit_frame_btn.clicked.connect(self._rename_selected_frame)
         self._delete_frame_btn.clicked.connect(self._delete_selected_frame)
 
+        # Video view drag-and-drop (forwarded events are accepted/ignored by the handlers)
+        self._video_view.drag_entered.connect(self._handle_drag_enter)
+        self._video_view.drag_left.connect(self._handle_drag_leave)
+        self._video_view.dropped.connect(self._handle_drop)
+
         # Video view click for annotations
         self._video_view.annotation_requested.connect(self._on_annotation_requested)
 
@@ -403,35 +471,61 @@ class MainWindow(QMainWindow):
     def _load_video(self, path: Path) -> None:
         self._player_controller.pause()
         self._player_controller.load(path)
-        self._position_slider.setValue(0)
-        self._time_label.setText("00:00.000 / 00:00.000")
+        # Keep loop checkbox state as user preference; just re-apply to controller
+        self._player_controller.set_looping(self._looping)
         self._media_loaded = True
         self._fit_pending = True
-        self._saved_frames.clear()
-        self._annotations.clear()
-        self._masks.clear()
-        if self._tree_root:
-            self._tree_root.takeChildren()
-        self._update_controls_enabled(True)
-        self._play_btn.setIcon(self._icon_for_style(QStyle.SP_MediaPlay))
-        self._selection_btn.setChecked(True)
-        # Keep loop checkbox state as user preference; just re-apply to controller
-        self._player_controller.set_looping(self._loop_checkbox.isChecked())
-        self.setWindowTitle(f"VideoML Editor - {path.name}")
-        self._file_label.setText(f"Vídeo: {path.name}")
-        self._update_frame_label(0)
-        self._update_properties("Nenhum item selecionado")
-        self._update_interest_actions_enabled()
+        self._clear_saved_frames()
+        # No frame of the new file is shown yet, so its first tick always writes the labels
+        self._current_frame = -1
+        # Return to the event loop first so pending paint/drag events flush before the resets
+        self._pending_load_path = path
+        QTimer.singleShot(0, self._finalize_load)
+
+    def _finalize_load(self) -> None:
+        path = self._pending_load_path
+        if path is None:
+            # Already finalized, or the load failed in the meantime
+            return
+        self._pending_load_path = None
+        # Coalesce the widget updates below into a single repaint
+        self.setUpdatesEnabled(False)
+        try:
+            self._position_slider.setValue(0)
+            # durationChanged may have landed before this pass; keep what it reported
+            self._update_time_label(0, self._position_slider.maximum())
+            self._update_controls_enabled(self._media_loaded)
+            self._set_play_icon(False)
+            self._selection_btn.setChecked(True)
+            self.setWindowTitle(f"VideoML Editor - {path.name}")
+            self._set_label_text(self._file_label, f"Vídeo: {path.name}")
+            self._update_frame_label(0)
+            self._update_properties("Nenhum item selecionado")
+            self._update_interest_actions_enabled()
+        finally:
+            self.setUpdatesEnabled(True)
 
     def _on_position_changed(self, position_ms: int) -> None:
+        if not self.isVisible() or self.isMinimized():
+            # Nobody is looking; catch the widgets up once the window is shown again
+            self._hidden_position_ms = position_ms
+            return
+        self._hidden_position_ms = None
         if not self._slider_is_active:
-            self._position_slider.setValue(position_ms)
-        self._update_time_label(position_ms, self._position_slider.maximum())
+            # Purely visual sync; nothing should react to valueChanged from playback ticks
+            slider = self._position_slider
+            slider.blockSignals(True)
+            slider.setValue(position_ms)
+            slider.blockSignals(False)
+        self._last_position_ms = position_ms
+        now_ns = time.monotonic_ns()
+        if not self._player_controller.is_playing() or now_ns - self._last_time_label_ns >= 100_000_000:
+            self._last_time_label_ns = now_ns
+            self._update_time_label(position_ms, self._position_slider.maximum())
         self._update_frame_label(position_ms)
         
         # Update visible annotations and mask for current frame
-        self._video_view.set_annotations(self._annotations.get(self._current_frame, []))
-        self._video_view.set_mask(self._masks.get(self._current_frame))
+        self._push_overlays()
 
     def _on_duration_changed(self, duration_ms: int) -> None:
         self._position_slider.setRange(0, max(0, duration_ms))
@@ -442,17 +536,32 @@ class MainWindow(QMainWindow):
     def _on_playback_state_changed(self, state: QMediaPlayer.PlaybackState) -> None:
         is_playing = state == QMediaPlayer.PlayingState
         self._play_btn.setEnabled(self._media_loaded)
-        self._play_btn.setIcon(self._icon_for_style(QStyle.SP_MediaPause if is_playing else QStyle.SP_MediaPlay))
+        self._set_play_icon(is_playing)
+        if not is_playing:
+            # Show the exact stop position that throttling may have skipped
+            self._update_time_label(self._last_position_ms, self._position_slider.maximum())
         status_text = "Reproduzindo" if is_playing else "Pausado"
         self.statusBar().showMessage(status_text, 2000)
 
+    def _set_play_icon(self, playing: bool) -> None:
+        if playing == self._play_btn_shows_pause:
+            return
+        self._play_btn_shows_pause = playing
+        self._play_btn.setIcon(self._icon_pause if playing else self._icon_play)
+
     def _on_frame_rate_changed(self, frame_rate: float) -> None:
+        fps_text = f"FPS: {frame_rate:.2f}"
+        if abs(frame_rate - self._frame_rate) < 1e-6 and self._label_texts.get(self._fps_label) == fps_text:
+            # Same rate re-announced (e.g. reloading a file at the same FPS)
+            return
         if frame_rate > 0:
             self._frame_rate = frame_rate
-        single_step = max(1, int(1000 / frame_rate))
+            self._ms_per_frame = 1000.0 / frame_rate
+        single_step = max(1, int(self._ms_per_frame))
         self._position_slider.setSingleStep(single_step)
-        self._fps_label.setText(f"FPS: {frame_rate:.2f}")
-        self.statusBar().showMessage(f"Taxa de frames: {frame_rate:.2f} fps")
+        self._set_label_text(self._fps_label, fps_text)
+        if self.isVisible() and not self.isMinimized():
+            self.statusBar().showMessage(f"Taxa de frames: {frame_rate:.2f} fps")
 
     def _on_media_status_changed(self, status: QMediaPlayer.MediaStatus) -> None:
         if status == QMediaPlayer.InvalidMedia:
@@ -465,13 +574,7 @@ class MainWindow(QMainWindow):
     def _on_error(self, message: str) -> None:
         self._media_loaded = False
         self._fit_pending = False
-        self._saved_frames.clear()
-        self._annotations.clear()
-        self._masks.clear()
-        if self._tree_root:
-            self._tree_root.takeChildren()
-        self._update_properties("Nenhum item selecionado")
-        self._update_controls_enabled(False)
+        self._reset_after_failed_load()
         QMessageBox.critical(self, "Erro ao carregar vídeo", message)
 
     def _on_slider_pressed(self) -> None:
@@ -479,51 +582,92 @@ class MainWindow(QMainWindow):
 
     def _on_slider_released(self) -> None:
         self._slider_is_active = False
+        # The release position supersedes any seek still waiting on the debounce timer
+        self._seek_debounce.stop()
+        self._pending_seek_ms = None
         self._player_controller.set_position(self._position_slider.value())
+        # The properties pane is only refreshed once the drag settles; ticks during it skip the pane
+        if self._media_loaded and not self._has_selected_interest():
+            self._update_properties(f"Frame atual: {self._current_frame}")
 
     def _on_slider_moved(self, value: int) -> None:
         if self._media_loaded:
-            self._player_controller.set_position(value)
+            self._pending_seek_ms = value
+            if not self._seek_debounce.isActive():
+                self._seek_debounce.start()
             self._update_time_label(value, self._position_slider.maximum())
             self._update_frame_label(value)
-            if self._selection_btn.isChecked():
-                self._update_properties(f"Frame atual: {self._current_frame}")
+
+    def _set_looping(self, enabled: bool) -> None:
+        self._looping = enabled
+        self._player_controller.set_looping(enabled)
+
+    def _flush_pending_seek(self) -> None:
+        """Issue the latest seek requested while the slider was being dragged."""
+        if self._pending_seek_ms is None:
+            return
+        position_ms = self._pending_seek_ms
+        self._pending_seek_ms = None
+        self._player_controller.set_position(position_ms)
 
     # ==================== Context menus ====================
 
-    def _show_point_context_menu(self, pos) -> None:
-        """Show context menu for point tool configuration."""
-        menu = QMenu(self)
-        
-        # Size configuration
-        size_label = QLabel("  Tamanho: ")
-        size_spinbox = QSpinBox()
-        size_spinbox.setRange(1, 50)
-        size_spinbox.setValue(self._point_size)
-        size_spinbox.valueChanged.connect(lambda val: setattr(self, '_point_size', val))
-        
-        size_layout = QHBoxLayout()
-        size_layout.addWidget(size_label)
-        size_layout.addWidget(size_spinbox)
-        size_layout.setContentsMargins(4, 4, 4, 4)
-        
-        size_widget = QWidget()
-        size_widget.setLayout(size_layout)
-        
-        size_action = QWidgetAction(menu)
-        size_action.setDefaultWidget(size_widget)
-        menu.addAction(size_action)
-        
-        menu.addSeparator()
-        
-        # Color configuration
+    def _show_tool_menu(self, key: str, build: Callable[[QMenu], Callable[[], None]], button: QPushButton, pos) -> None:
+        """Pop up a tool's configuration menu, building it on first use.
+
+        ``build`` fills the menu once and returns a callable that syncs its widgets
+        with the current tool settings before each popup.
+        """
+        entry = self._tool_menus.get(key)
+        if entry is None:
+            menu = QMenu(self)
+            entry = (menu, build(menu))
+            self._tool_menus[key] = entry
+        menu, sync = entry
+        sync()
+        menu.exec(button.mapToGlobal(pos))
+
+    def _add_menu_spinbox(self, menu: QMenu, text: str, minimum: int, maximum: int, slot) -> QSpinBox:
+        label = QLabel(text)
+        spinbox = QSpinBox()
+        spinbox.setRange(minimum, maximum)
+        spinbox.valueChanged.connect(slot)
+        
+        layout = QHBoxLayout()
+        layout.addWidget(label)
+        layout.addWidget(spinbox)
+        layout.setContentsMargins(4, 4, 4, 4)
+        
+        widget = QWidget()
+        widget.setLayout(layout)
+        
+        action = QWidgetAction(menu)
+        action.setDefaultWidget(widget)
+        menu.addAction(action)
+        return spinbox
+
+    def _add_menu_color_rows(self, menu: QMenu, choose_slot) -> Callable[[QColor], None]:
+        """Add the "choose color" entry plus a current-color preview.
+
+        Returns a callable that repaints the preview swatch; it is a no-op while the
+        color is unchanged, so syncing before every popup stays cheap.
+        """
         color_action = menu.addAction("  Escolher cor...")
-        color_action.triggered.connect(self._choose_point_color)
+        color_action.triggered.connect(choose_slot)
         
-        # Color preview
-        preview_label = QLabel(f"  Cor atual: ")
-        preview_box = QLabel("    ")
-        preview_box.setStyleSheet(f"background-color: {self._point_color.name()}; border: 1px solid black;")
+        preview_label = QLabel("  Cor atual: ")
+        preview_box = QLabel()
+        preview_box.setFrameShape(QFrame.Box)
+        swatch = QPixmap(16, 16)
+        shown_rgba: int | None = None
+
+        def show_color(color: QColor) -> None:
+            nonlocal shown_rgba
+            if color.rgba() == shown_rgba:
+                return
+            shown_rgba = color.rgba()
+            swatch.fill(color)
+            preview_box.setPixmap(swatch)
         
         preview_layout = QHBoxLayout()
         preview_layout.addWidget(preview_label)
@@ -537,22 +681,51 @@ class MainWindow(QMainWindow):
         preview_action = QWidgetAction(menu)
         preview_action.setDefaultWidget(preview_widget)
         menu.addAction(preview_action)
-        
-        menu.exec(self._point_btn.mapToGlobal(pos))
+        return show_color
+
+    def _show_point_context_menu(self, pos) -> None:
+        """Show context menu for point tool configuration."""
+        self._show_tool_menu("point", self._build_point_menu, self._point_btn, pos)
+
+    def _build_point_menu(self, menu: QMenu) -> Callable[[], None]:
+        size_spinbox = self._add_menu_spinbox(menu, "  Tamanho: ", 1, 50, self._set_point_size)
+        menu.addSeparator()
+        show_color = self._add_menu_color_rows(menu, self._choose_point_color)
+
+        def sync() -> None:
+            size_spinbox.setValue(self._point_size)
+            show_color(self._point_color)
+
+        return sync
+
+    def _set_point_size(self, val: int) -> None:
+        self._point_size = val
+
+    def _pick_color(self, initial: QColor, title: str) -> QColor | None:
+        """Run the shared color dialog; return the chosen color, or None if cancelled."""
+        dialog = self._color_dialog
+        if dialog is None:
+            dialog = self._color_dialog = QColorDialog(self)
+        dialog.setWindowTitle(title)
+        dialog.setCurrentColor(initial)
+        if dialog.exec() != QColorDialog.Accepted:
+            return None
+        color = dialog.currentColor()
+        return color if color.isValid() else None
 
     def _choose_point_color(self) -> None:
         """Open color dialog to choose point color."""
-        color = QColorDialog.getColor(self._point_color, self, "Escolher cor do ponto")
-        if color.isValid():
+        color = self._pick_color(self._point_color, "Escolher cor do ponto")
+        if color is not None:
             self._point_color = color
 
     def _show_line_context_menu(self, pos) -> None:
         """Show context menu for line tool configuration."""
-        menu = QMenu(self)
-        
+        self._show_tool_menu("line", self._build_line_menu, self._line_btn, pos)
+
+    def _build_line_menu(self, menu: QMenu) -> Callable[[], None]:
         # Guide line checkbox
         guide_checkbox = QCheckBox("  Linha Guia")
-        guide_checkbox.setChecked(self._line_guide_enabled)
         guide_checkbox.toggled.connect(self._on_line_guide_toggled)
         
         guide_action = QWidgetAction(menu)
@@ -560,51 +733,19 @@ class MainWindow(QMainWindow):
         menu.addAction(guide_action)
         
         menu.addSeparator()
-        
-        # Width configuration
-        width_label = QLabel("  Espessura: ")
-        width_spinbox = QSpinBox()
-        width_spinbox.setRange(1, 20)
-        width_spinbox.setValue(self._line_width)
-        width_spinbox.valueChanged.connect(lambda val: setattr(self, '_line_width', val))
-        
-        width_layout = QHBoxLayout()
-        width_layout.addWidget(width_label)
-        width_layout.addWidget(width_spinbox)
-        width_layout.setContentsMargins(4, 4, 4, 4)
-        
-        width_widget = QWidget()
-        width_widget.setLayout(width_layout)
-        
-        width_action = QWidgetAction(menu)
-        width_action.setDefaultWidget(width_widget)
-        menu.addAction(width_action)
-        
+        width_spinbox = self._add_menu_spinbox(menu, "  Espessura: ", 1, 20, self._set_line_width)
         menu.addSeparator()
-        
-        # Color configuration
-        color_action = menu.addAction("  Escolher cor...")
-        color_action.triggered.connect(self._choose_line_color)
-        
-        # Color preview
-        preview_label = QLabel("  Cor atual: ")
-        preview_box = QLabel("    ")
-        preview_box.setStyleSheet(f"background-color: {self._line_color.name()}; border: 1px solid black;")
-        
-        preview_layout = QHBoxLayout()
-        preview_layout.addWidget(preview_label)
-        preview_layout.addWidget(preview_box)
-        preview_layout.addStretch()
-        preview_layout.setContentsMargins(4, 4, 4, 4)
-        
-        preview_widget = QWidget()
-        preview_widget.setLayout(preview_layout)
-        
-        preview_action = QWidgetAction(menu)
-        preview_action.setDefaultWidget(preview_widget)
-        menu.addAction(preview_action)
-        
-        menu.exec(self._line_btn.mapToGlobal(pos))
+        show_color = self._add_menu_color_rows(menu, self._choose_line_color)
+
+        def sync() -> None:
+            guide_checkbox.setChecked(self._line_guide_enabled)
+            width_spinbox.setValue(self._line_width)
+            show_color(self._line_color)
+
+        return sync
+
+    def _set_line_width(self, val: int) -> None:
+        self._line_width = val
 
     def _on_line_guide_toggled(self, checked: bool) -> None:
         """Toggle line guide preview."""
@@ -613,192 +754,81 @@ class MainWindow(QMainWindow):
 
     def _choose_line_color(self) -> None:
         """Open color dialog to choose line color."""
-        color = QColorDialog.getColor(self._line_color, self, "Escolher cor da reta")
-        if color.isValid():
+        color = self._pick_color(self._line_color, "Escolher cor da reta")
+        if color is not None:
             self._line_color = color
             self._video_view.set_line_preview_style(self._line_color, self._line_width)
 
     def _show_angle_context_menu(self, pos) -> None:
         """Show context menu for angle tool configuration."""
-        menu = QMenu(self)
-        
-        # Width configuration
-        width_label = QLabel("  Espessura: ")
-        width_spinbox = QSpinBox()
-        width_spinbox.setRange(1, 20)
-        width_spinbox.setValue(self._angle_width)
-        width_spinbox.valueChanged.connect(lambda val: setattr(self, '_angle_width', val))
-        
-        width_layout = QHBoxLayout()
-        width_layout.addWidget(width_label)
-        width_layout.addWidget(width_spinbox)
-        width_layout.setContentsMargins(4, 4, 4, 4)
-        
-        width_widget = QWidget()
-        width_widget.setLayout(width_layout)
-        
-        width_action = QWidgetAction(menu)
-        width_action.setDefaultWidget(width_widget)
-        menu.addAction(width_action)
-        
+        self._show_tool_menu("angle", self._build_angle_menu, self._angle_btn, pos)
+
+    def _build_angle_menu(self, menu: QMenu) -> Callable[[], None]:
+        width_spinbox = self._add_menu_spinbox(menu, "  Espessura: ", 1, 20, self._set_angle_width)
         menu.addSeparator()
-        
-        # Color configuration
-        color_action = menu.addAction("  Escolher cor...")
-        color_action.triggered.connect(self._choose_angle_color)
-        
-        # Color preview
-        preview_label = QLabel("  Cor atual: ")
-        preview_box = QLabel("    ")
-        preview_box.setStyleSheet(f"background-color: {self._angle_color.name()}; border: 1px solid black;")
-        
-        preview_layout = QHBoxLayout()
-        preview_layout.addWidget(preview_label)
-        preview_layout.addWidget(preview_box)
-        preview_layout.addStretch()
-        preview_layout.setContentsMargins(4, 4, 4, 4)
-        
-        preview_widget = QWidget()
-        preview_widget.setLayout(preview_layout)
-        
-        preview_action = QWidgetAction(menu)
-        preview_action.setDefaultWidget(preview_widget)
-        menu.addAction(preview_action)
-        
-        menu.exec(self._angle_btn.mapToGlobal(pos))
+        show_color = self._add_menu_color_rows(menu, self._choose_angle_color)
+
+        def sync() -> None:
+            width_spinbox.setValue(self._angle_width)
+            show_color(self._angle_color)
+
+        return sync
+
+    def _set_angle_width(self, val: int) -> None:
+        self._angle_width = val
 
     def _choose_angle_color(self) -> None:
         """Open color dialog to choose angle color."""
-        color = QColorDialog.getColor(self._angle_color, self, "Escolher cor do ângulo")
-        if color.isValid():
+        color = self._pick_color(self._angle_color, "Escolher cor do ângulo")
+        if color is not None:
             self._angle_color = color
             self._video_view.set_angle_preview_style(self._angle_color, self._angle_width)
 
     def _show_freehand_context_menu(self, pos) -> None:
         """Show context menu for freehand tool configuration."""
-        menu = QMenu(self)
-        
-        # Width configuration
-        width_label = QLabel("  Espessura: ")
-        width_spinbox = QSpinBox()
-        width_spinbox.setRange(1, 20)
-        width_spinbox.setValue(self._freehand_width)
-        width_spinbox.valueChanged.connect(lambda val: setattr(self, '_freehand_width', val))
-        
-        width_layout = QHBoxLayout()
-        width_layout.addWidget(width_label)
-        width_layout.addWidget(width_spinbox)
-        width_layout.setContentsMargins(4, 4, 4, 4)
-        
-        width_widget = QWidget()
-        width_widget.setLayout(width_layout)
-        
-        width_action = QWidgetAction(menu)
-        width_action.setDefaultWidget(width_widget)
-        menu.addAction(width_action)
-        
+        self._show_tool_menu("freehand", self._build_freehand_menu, self._freehand_btn, pos)
+
+    def _build_freehand_menu(self, menu: QMenu) -> Callable[[], None]:
+        width_spinbox = self._add_menu_spinbox(menu, "  Espessura: ", 1, 20, self._set_freehand_width)
         menu.addSeparator()
-        
-        # Color configuration
-        color_action = menu.addAction("  Escolher cor...")
-        color_action.triggered.connect(self._choose_freehand_color)
-        
-        # Color preview
-        preview_label = QLabel("  Cor atual: ")
-        preview_box = QLabel("    ")
-        preview_box.setStyleSheet(f"background-color: {self._freehand_color.name()}; border: 1px solid black;")
-        
-        preview_layout = QHBoxLayout()
-        preview_layout.addWidget(preview_label)
-        preview_layout.addWidget(preview_box)
-        preview_layout.addStretch()
-        preview_layout.setContentsMargins(4, 4, 4, 4)
-        
-        preview_widget = QWidget()
-        preview_widget.setLayout(preview_layout)
-        
-        preview_action = QWidgetAction(menu)
-        preview_action.setDefaultWidget(preview_widget)
-        menu.addAction(preview_action)
-        
-        menu.exec(self._freehand_btn.mapToGlobal(pos))
+        show_color = self._add_menu_color_rows(menu, self._choose_freehand_color)
+
+        def sync() -> None:
+            width_spinbox.setValue(self._freehand_width)
+            show_color(self._freehand_color)
+
+        return sync
+
+    def _set_freehand_width(self, val: int) -> None:
+        self._freehand_width = val
 
     def _choose_freehand_color(self) -> None:
         """Open color dialog to choose freehand color."""
-        color = QColorDialog.getColor(self._freehand_color, self, "Escolher cor da máscara")
-        if color.isValid():
+        color = self._pick_color(self._freehand_color, "Escolher cor da máscara")
+        if color is not None:
             self._freehand_color = color
             self._video_view.set_freehand_style(self._freehand_color, self._freehand_width)
 
     def _show_brush_context_menu(self, pos) -> None:
         """Show context menu for brush tool configuration."""
-        menu = QMenu(self)
-        
-        # Diameter configuration
-        diameter_label = QLabel("  Diâmetro: ")
-        diameter_spinbox = QSpinBox()
-        diameter_spinbox.setRange(1, 100)
-        diameter_spinbox.setValue(self._brush_diameter)
-        diameter_spinbox.valueChanged.connect(self._on_brush_diameter_changed)
-        
-        diameter_layout = QHBoxLayout()
-        diameter_layout.addWidget(diameter_label)
-        diameter_layout.addWidget(diameter_spinbox)
-        diameter_layout.setContentsMargins(4, 4, 4, 4)
-        
-        diameter_widget = QWidget()
-        diameter_widget.setLayout(diameter_layout)
-        
-        diameter_action = QWidgetAction(menu)
-        diameter_action.setDefaultWidget(diameter_widget)
-        menu.addAction(diameter_action)
-        
+        self._show_tool_menu("brush", self._build_brush_menu, self._brush_btn, pos)
+
+    def _build_brush_menu(self, menu: QMenu) -> Callable[[], None]:
+        diameter_spinbox = self._add_menu_spinbox(menu, "  Diâmetro: ", 1, 100, self._on_brush_diameter_changed)
         menu.addSeparator()
-        
-        # Width configuration
-        width_label = QLabel("  Espessura contorno: ")
-        width_spinbox = QSpinBox()
-        width_spinbox.setRange(1, 20)
-        width_spinbox.setValue(self._brush_width)
-        width_spinbox.valueChanged.connect(lambda val: setattr(self, '_brush_width', val))
-        
-        width_layout = QHBoxLayout()
-        width_layout.addWidget(width_label)
-        width_layout.addWidget(width_spinbox)
-        width_layout.setContentsMargins(4, 4, 4, 4)
-        
-        width_widget = QWidget()
-        width_widget.setLayout(width_layout)
-        
-        width_action = QWidgetAction(menu)
-        width_action.setDefaultWidget(width_widget)
-        menu.addAction(width_action)
-        
+        width_spinbox = self._add_menu_spinbox(menu, "  Espessura contorno: ", 1, 20, self._set_brush_width)
         menu.addSeparator()
-        
-        # Color configuration
-        color_action = menu.addAction("  Escolher cor...")
-        color_action.triggered.connect(self._choose_brush_color)
-        
-        # Color preview
-        preview_label = QLabel("  Cor atual: ")
-        preview_box = QLabel("    ")
-        preview_box.setStyleSheet(f"background-color: {self._brush_color.name()}; border: 1px solid black;")
-        
-        preview_layout = QHBoxLayout()
-        preview_layout.addWidget(preview_label)
-        preview_layout.addWidget(preview_box)
-        preview_layout.addStretch()
-        preview_layout.setContentsMargins(4, 4, 4, 4)
-        
-        preview_widget = QWidget()
-        preview_widget.setLayout(preview_layout)
-        
-        preview_action = QWidgetAction(menu)
-        preview_action.setDefaultWidget(preview_widget)
-        menu.addAction(preview_action)
-        
-        menu.exec(self._brush_btn.mapToGlobal(pos))
+        show_color = self._add_menu_color_rows(menu, self._choose_brush_color)
+
+        def sync() -> None:
+            diameter_spinbox.setValue(self._brush_diameter)
+            width_spinbox.setValue(self._brush_width)
+            show_color(self._brush_color)
+
+        return sync
+
+    def _set_brush_width(self, val: int) -> None:
+        self._brush_width = val
 
     def _on_brush_diameter_changed(self, val: int) -> None:
         """Handle brush diameter change."""
@@ -807,8 +837,8 @@ class MainWindow(QMainWindow):
 
     def _choose_brush_color(self) -> None:
         """Open color dialog to choose brush color."""
-        color = QColorDialog.getColor(self._brush_color, self, "Escolher cor da brush")
-        if color.isValid():
+        color = self._pick_color(self._brush_color, "Escolher cor da brush")
+        if color is not None:
             self._brush_color = color
             self._video_view.set_brush_style(self._brush_color, self._brush_width, self._brush_diameter)
 
@@ -911,7 +941,7 @@ class MainWindow(QMainWindow):
         if not self._media_loaded:
             return
         
-        if self._point_btn.isChecked():
+        if self._active_tool == "point":
             self._create_point_annotation(x, y)
 
     def _create_point_annotation(self, x: float, y: float) -> None:
@@ -919,30 +949,27 @@ class MainWindow(QMainWindow):
         frame = self._current_frame
         
         # Ensure frame exists in saved_frames
-        if not any(entry["frame"] == frame for entry in self._saved_frames):
-            self._saved_frames.append({"frame": frame, "name": None})
-            self._saved_frames.sort(key=lambda e: e["frame"])
-        
-        # Initialize annotations list for this frame if needed
-        if frame not in self._annotations:
-            self._annotations[frame] = []
+        self._ensure_saved_frame(frame)
         
         # Increment counter and create annotation
         self._annotation_counter["point"] += 1
-        annotation = {
-            "type": "point",
-            "x": x,
-            "y": y,
-            "size": self._point_size,
-            "color": QColor(self._point_color),  # Copy to preserve current settings
-            "name": None,
-            "id": self._annotation_counter["point"],
-        }
-        self._annotations[frame].append(annotation)
-        
-        # Update tree and video view
-        self._rebuild_frames_tree()
-        self._video_view.set_annotations(self._annotations.get(frame, []))
+        annotation = PointAnnotation(
+            x=x,
+            y=y,
+            size=self._point_size,
+            color=self._intern_color(self._point_color),  # Snapshot of current settings
+            id=self._annotation_counter["point"],
+        )
+        self._add_annotation(frame, annotation)
+
+    def _add_annotation(self, frame: int, annotation: Annotation) -> None:
+        """Store a new annotation under its frame and refresh the tree and video view."""
+        # The per-frame dicts are the frame index: they hold the records themselves, keyed
+        # like the tree rows, so lookups and deletes never scan or renumber anything
+        self._annotations.setdefault(frame, {})[(annotation.type, annotation.id)] = annotation
+        self._schedule_tree_update(frame)
+        self._touch_overlays(frame)
+        self._push_overlays()
 
     def _on_line_completed(self, x1: float, y1: float, x2: float, y2: float) -> None:
         """Handle line completion from video view."""
@@ -955,32 +982,20 @@ class MainWindow(QMainWindow):
         frame = self._current_frame
         
         # Ensure frame exists in saved_frames
-        if not any(entry["frame"] == frame for entry in self._saved_frames):
-            self._saved_frames.append({"frame": frame, "name": None})
-            self._saved_frames.sort(key=lambda e: e["frame"])
-        
-        # Initialize annotations list for this frame if needed
-        if frame not in self._annotations:
-            self._annotations[frame] = []
+        self._ensure_saved_frame(frame)
         
         # Increment counter and create annotation
         self._annotation_counter["line"] += 1
-        annotation = {
-            "type": "line",
-            "x1": x1,
-            "y1": y1,
-            "x2": x2,
-            "y2": y2,
-            "width": self._line_width,
-            "color": QColor(self._line_color),  # Copy to preserve current settings
-            "name": None,
-            "id": self._annotation_counter["line"],
-        }
-        self._annotations[frame].append(annotation)
-        
-        # Update tree and video view
-        self._rebuild_frames_tree()
-        self._video_view.set_annotations(self._annotations.get(frame, []))
+        annotation = LineAnnotation(
+            x1=x1,
+            y1=y1,
+            x2=x2,
+            y2=y2,
+            width=self._line_width,
+            color=self._intern_color(self._line_color),  # Snapshot of current settings
+            id=self._annotation_counter["line"],
+        )
+        self._add_annotation(frame, annotation)
     
     def _on_angle_completed(self, x1: float, y1: float, x2: float, y2: float, x3: float, y3: float) -> None:
         """Handle angle completion from video view."""
@@ -996,7 +1011,7 @@ class MainWindow(QMainWindow):
             # -1 signals that no angle is being drawn
             self._angle_display_label.setVisible(False)
         else:
-            self._angle_display_label.setText(f"∠ {angle:.4f}°")
+            self._set_label_text(self._angle_display_label, f"∠ {angle:.4f}°")
             self._angle_display_label.setVisible(True)
 
     def _create_angle_annotation(self, x1: float, y1: float, x2: float, y2: float, x3: float, y3: float) -> None:
@@ -1004,38 +1019,26 @@ class MainWindow(QMainWindow):
         frame = self._current_frame
         
         # Ensure frame exists in saved_frames
-        if not any(entry["frame"] == frame for entry in self._saved_frames):
-            self._saved_frames.append({"frame": frame, "name": None})
-            self._saved_frames.sort(key=lambda e: e["frame"])
-        
-        # Initialize annotations list for this frame if needed
-        if frame not in self._annotations:
-            self._annotations[frame] = []
+        self._ensure_saved_frame(frame)
         
         # Calculate the angle
         angle = self._calculate_angle_degrees(x1, y1, x2, y2, x3, y3)
         
         # Increment counter and create annotation
         self._annotation_counter["angle"] += 1
-        annotation = {
-            "type": "angle",
-            "x1": x1,
-            "y1": y1,
-            "x2": x2,
-            "y2": y2,
-            "x3": x3,
-            "y3": y3,
-            "angle": angle,
-            "width": self._angle_width,
-            "color": QColor(self._angle_color),
-            "name": None,
-            "id": self._annotation_counter["angle"],
-        }
-        self._annotations[frame].append(annotation)
-        
-        # Update tree and video view
-        self._rebuild_frames_tree()
-        self._video_view.set_annotations(self._annotations.get(frame, []))
+        annotation = AngleAnnotation(
+            x1=x1,
+            y1=y1,
+            x2=x2,
+            y2=y2,
+            x3=x3,
+            y3=y3,
+            angle=angle,
+            width=self._angle_width,
+            color=self._intern_color(self._angle_color),
+            id=self._annotation_counter["angle"],
+        )
+        self._add_annotation(frame, annotation)
 
     def _calculate_angle_degrees(self, x1: float, y1: float, x2: float, y2: float, x3: float, y3: float) -> float:
         """Calculate the angle at p2 formed by p1-p2-p3, always returning < 180 degrees."""
@@ -1045,28 +1048,11 @@ class MainWindow(QMainWindow):
         v2x = x3 - x2
         v2y = y3 - y2
         
-        # Calculate magnitudes
-        mag1 = math.sqrt(v1x * v1x + v1y * v1y)
-        mag2 = math.sqrt(v2x * v2x + v2y * v2y)
-        
-        if mag1 < 0.001 or mag2 < 0.001:
+        if math.hypot(v1x, v1y) < 0.001 or math.hypot(v2x, v2y) < 0.001:
             return 0.0
         
-        # Calculate dot product and angle
-        dot = v1x * v2x + v1y * v2y
-        cos_angle = dot / (mag1 * mag2)
-        
-        # Clamp to avoid numerical errors
-        cos_angle = max(-1.0, min(1.0, cos_angle))
-        
-        angle_rad = math.acos(cos_angle)
-        angle_deg = math.degrees(angle_rad)
-        
-        # Ensure angle is always < 180
-        if angle_deg > 180:
-            angle_deg = 360 - angle_deg
-        
-        return angle_deg
+        # atan2(|cross|, dot) lies in [0, 180] without the acos clamp or a wrap-around fix
+        return math.degrees(math.atan2(abs(v1x * v2y - v1y * v2x), v1x * v2x + v1y * v2y))
 
     # ==================== Mask handlers ====================
 
@@ -1087,9 +1073,7 @@ class MainWindow(QMainWindow):
         frame = self._current_frame
         
         # Ensure frame exists in saved_frames
-        if not any(entry["frame"] == frame for entry in self._saved_frames):
-            self._saved_frames.append({"frame": frame, "name": None})
-            self._saved_frames.sort(key=lambda e: e["frame"])
+        self._ensure_saved_frame(frame)
         
         # Check if mask already exists for this frame
         if frame in self._masks:
@@ -1103,79 +1087,96 @@ class MainWindow(QMainWindow):
             self._masks[frame] = {
                 "type": "mask",
                 "path": new_path,
-                "width": self._freehand_width if self._freehand_btn.isChecked() else self._brush_width,
-                "color": QColor(self._freehand_color if self._freehand_btn.isChecked() else self._brush_color),
+                "width": self._freehand_width if self._active_tool == "freehand" else self._brush_width,
+                "color": self._intern_color(self._freehand_color if self._active_tool == "freehand" else self._brush_color),
                 "name": None,
                 "id": self._mask_counter,
             }
         
         # Update tree and video view
-        self._rebuild_frames_tree()
-        self._video_view.set_mask(self._masks.get(frame))
+        self._schedule_tree_update(frame)
+        self._touch_overlays(frame)
+        self._push_overlays()
 
     # ==================== Tool toggle handlers ====================
 
-    def _on_selection_toggled(self, checked: bool) -> None:
-        if checked:
-            self._video_view.set_hand_mode(False)
-            self._video_view.set_current_tool("selection")
-            self._video_view.viewport().setCursor(Qt.ArrowCursor)
-
-    def _on_hand_toggled(self, checked: bool) -> None:
-        self._video_view.set_hand_mode(checked)
-        self._video_view.set_current_tool("hand" if checked else "selection")
-
-    def _on_point_toggled(self, checked: bool) -> None:
-        if checked:
-            self._video_view.set_hand_mode(False)
-            self._video_view.set_current_tool("point")
-            self._video_view.viewport().setCursor(Qt.CrossCursor)
-        else:
-            self._video_view.set_current_tool("selection")
-    
-    def _on_line_toggled(self, checked: bool) -> None:
-        if checked:
-            self._video_view.set_hand_mode(False)
-            self._video_view.set_current_tool("line")
-            self._video_view.set_line_guide_enabled(self._line_guide_enabled)
-            self._video_view.set_line_preview_style(self._line_color, self._line_width)
-            self._video_view.viewport().setCursor(Qt.CrossCursor)
-        else:
-            self._video_view.set_current_tool("selection")
+    def _on_tool_toggled(self, tool_id: int, checked: bool) -> None:
+        """Single slot for the exclusive tool group.
 
-    def _on_angle_toggled(self, checked: bool) -> None:
+        A swap emits once for the old button (unchecked) and once for the new one
+        (checked); only the checked side configures the view.
+        """
         if checked:
-            self._video_view.set_hand_mode(False)
-            self._video_view.set_current_tool("angle")
-            self._video_view.set_angle_preview_style(self._angle_color, self._angle_width)
-            self._video_view.viewport().setCursor(Qt.CrossCursor)
-        else:
-            self._video_view.set_current_tool("selection")
+            self._tool_enter_handlers[tool_id]()
+            return
+        if self._tool_group.button(tool_id) is self._angle_btn:
             # Hide angle display when tool is deselected
             self._angle_display_label.setVisible(False)
-
-    def _on_freehand_toggled(self, checked: bool) -> None:
-        if checked:
+        if self._tool_released():
             self._video_view.set_hand_mode(False)
-            self._video_view.set_current_tool("freehand")
-            self._video_view.set_freehand_style(self._freehand_color, self._freehand_width)
-            self._video_view.viewport().setCursor(Qt.CrossCursor)
-        else:
-            self._video_view.set_current_tool("selection")
+            self._set_active_tool("selection")
 
-    def _on_brush_toggled(self, checked: bool) -> None:
-        if checked:
-            self._video_view.set_hand_mode(False)
-            self._video_view.set_current_tool("brush")
-            self._video_view.set_brush_style(self._brush_color, self._brush_width, self._brush_diameter)
-            self._video_view.viewport().setCursor(Qt.CrossCursor)
-        else:
-            self._video_view.set_current_tool("selection")
+    def _set_active_tool(self, tool: str) -> None:
+        self._active_tool = tool
+        self._video_view.set_current_tool(tool)
+
+    def _tool_released(self) -> bool:
+        """Whether an unchecked tool left no other tool active.
+
+        The exclusive group unchecks the previous tool before the new one's toggled
+        fires, so resetting to selection here would just be overwritten.
+        """
+        return self._tool_group.checkedButton() is None
+
+    def _enter_selection_tool(self) -> None:
+        self._video_view.set_hand_mode(False)
+        self._set_active_tool("selection")
+        self._video_view.viewport().setCursor(Qt.ArrowCursor)
+
+    def _enter_hand_tool(self) -> None:
+        self._video_view.set_hand_mode(True)
+        self._set_active_tool("hand")
+
+    def _enter_point_tool(self) -> None:
+        self._video_view.set_hand_mode(False)
+        self._set_active_tool("point")
+        self._video_view.viewport().setCursor(Qt.CrossCursor)
+
+    def _enter_line_tool(self) -> None:
+        self._video_view.set_hand_mode(False)
+        self._set_active_tool("line")
+        self._video_view.set_line_guide_enabled(self._line_guide_enabled)
+        self._video_view.set_line_preview_style(self._line_color, self._line_width)
+        self._video_view.viewport().setCursor(Qt.CrossCursor)
+
+    def _enter_angle_tool(self) -> None:
+        self._video_view.set_hand_mode(False)
+        self._set_active_tool("angle")
+        self._video_view.set_angle_preview_style(self._angle_color, self._angle_width)
+        self._video_view.viewport().setCursor(Qt.CrossCursor)
+
+    def _enter_freehand_tool(self) -> None:
+        self._video_view.set_hand_mode(False)
+        self._set_active_tool("freehand")
+        self._video_view.set_freehand_style(self._freehand_color, self._freehand_width)
+        self._video_view.viewport().setCursor(Qt.CrossCursor)
+
+    def _enter_brush_tool(self) -> None:
+        self._video_view.set_hand_mode(False)
+        self._set_active_tool("brush")
+        self._video_view.set_brush_style(self._brush_color, self._brush_width, self._brush_diameter)
+        self._video_view.viewport().setCursor(Qt.CrossCursor)
     
     # endregion
 
     # region Helpers
     def _update_controls_enabled(self, enabled: bool) -> None:
+        # The tree and row actions also depend on the saved frames and selection; always refresh them
+        self._frames_tree.setEnabled(enabled or bool(self._frame_values))
+        self._update_interest_actions_enabled()
+        if enabled == self._controls_enabled:
+            return
+        self._controls_enabled = enabled
         self._back_frame_btn.setEnabled(enabled)
         self._forward_frame_btn.setEnabled(enabled)
         self._play_btn.setEnabled(enabled)
@@ -1185,25 +1186,39 @@ class MainWindow(QMainWindow):
         self._end_btn.setEnabled(enabled)
         self._loop_checkbox.setEnabled(True)  # allow toggling even without media
         self._save_frame_btn.setEnabled(enabled)
-        self._frames_tree.setEnabled(enabled or bool(self._saved_frames))
-        self._update_interest_actions_enabled()
         if not enabled:
             self._hand_btn.setChecked(False)
             self._video_view.set_hand_mode(False)
         self._position_slider.setEnabled(enabled)
 
     def _update_time_label(self, position_ms: int, duration_ms: int) -> None:
+        key = (position_ms, duration_ms)
+        if key == self._time_label_key:
+            return
+        self._time_label_key = key
         position_text = self._ms_to_timestamp(position_ms)
-        duration_text = self._ms_to_timestamp(duration_ms)
-        self._time_label.setText(f"{position_text} / {duration_text}")
+        # The duration is constant during playback, so format it only when it changes
+        if duration_ms != self._duration_text_ms:
+            self._duration_text_ms = duration_ms
+            self._duration_text = self._format_timestamp(duration_ms)
+        self._set_label_text(self._time_label, f"{position_text} / {self._duration_text}")
+
+    def _set_label_text(self, label: QLabel, text: str) -> None:
+        """setText that skips the relayout when the label already shows ``text``."""
+        if self._label_texts.get(label) == text:
+            return
+        self._label_texts[label] = text
+        label.setText(text)
 
     def _update_frame_label(self, position_ms: int) -> None:
-        if self._frame_rate <= 0:
-            self._frame_rate = 30.0
-        frame = int(round(position_ms / (1000.0 / self._frame_rate)))
+        frame = int(position_ms / self._ms_per_frame + 0.5)
+        if frame == self._current_frame:
+            # Several position ticks land on the same frame; the labels are already current
+            return
         self._current_frame = frame
-        self._frame_label.setText(f"Frame: {frame}")
-        if not self._has_selected_interest():
+        self._set_label_text(self._frame_label, f"Frame: {frame}")
+        # During a drag the pane waits for _on_slider_released
+        if not self._slider_is_active and not self._has_selected_interest():
             self._update_properties(f"Frame atual: {frame}")
 
     def _save_current_frame(self) -> None:
@@ -1212,186 +1227,250 @@ class MainWindow(QMainWindow):
         frame = self._current_frame
         if frame < 0:
             return
-        if any(entry["frame"] == frame for entry in self._saved_frames):
+        if self._saved_frame_index(frame) is not None:
             return
 
-        self._saved_frames.append({"frame": frame, "name": None})
-        self._saved_frames.sort(key=lambda e: e["frame"])
-        self._rebuild_frames_tree()
+        self._ensure_saved_frame(frame)
+        self._add_tree_item(frame)
         self._update_interest_actions_enabled()
 
-    def _rebuild_frames_tree(self) -> None:
+    def _intern_color(self, color: QColor) -> QColor:
+        """Return a shared snapshot of ``color``; stored annotation colors are never mutated."""
+        key = color.rgba()
+        interned = self._color_intern.get(key)
+        if interned is None:
+            interned = QColor(color)
+            self._color_intern[key] = interned
+        return interned
+
+    def _touch_overlays(self, frame: int) -> None:
+        """Mark a frame's annotations or mask as changed so the view gets them again."""
+        self._overlay_revs[frame] = self._overlay_revs.get(frame, 0) + 1
+
+    def _push_overlays(self) -> None:
+        """Send the current frame's annotations and mask to the view unless it already has them."""
+        frame = self._current_frame
+        key = (frame, self._overlay_revs.get(frame, 0))
+        if key == self._pushed_overlay:
+            return
+        self._pushed_overlay = key
+        self._video_view.set_annotations(list(self._annotations.get(frame, {}).values()))
+        self._video_view.set_mask(self._masks.get(frame))
+
+    def _clear_saved_frames(self) -> None:
+        del self._frame_values[:]
+        self._frame_names.clear()
+        self._annotations.clear()
+        self._masks.clear()
+        self._overlay_revs.clear()
+        self._pushed_overlay = None
+        if self._tree_root:
+            tree = self._frames_tree
+            suspend = tree.updatesEnabled()
+            if suspend:
+                tree.setUpdatesEnabled(False)
+            tree.blockSignals(True)
+            try:
+                self._tree_root.takeChildren()
+            finally:
+                tree.blockSignals(False)
+                if suspend:
+                    tree.setUpdatesEnabled(True)
+        self._frame_items.clear()
+        self._child_items.clear()
+        self._stale_tree_frames.clear()
+
+    def _reset_after_failed_load(self) -> None:
+        self._pending_load_path = None
+        # Batch the reset into one repaint before the modal dialog takes over
+        self.setUpdatesEnabled(False)
+        try:
+            self._clear_saved_frames()
+            self._update_properties("Nenhum item selecionado")
+            self._update_controls_enabled(False)
+        finally:
+            self.setUpdatesEnabled(True)
+
+    def _saved_frame_index(self, frame: int) -> int | None:
+        """Return the position of a saved frame in the parallel arrays, or None."""
+        index = bisect.bisect_left(self._frame_values, frame)
+        if index < len(self._frame_values) and self._frame_values[index] == frame:
+            return index
+        return None
+
+    def _ensure_saved_frame(self, frame: int) -> int:
+        """Return the index of a saved frame, inserting it in sorted position if missing."""
+        index = bisect.bisect_left(self._frame_values, frame)
+        if index == len(self._frame_values) or self._frame_values[index] != frame:
+            self._frame_values.insert(index, frame)
+            self._frame_names.insert(index, None)
+        return index
+
+    def _remove_saved_frame(self, frame: int) -> None:
+        index = self._saved_frame_index(frame)
+        if index is None:
+            return
+        del self._frame_values[index]
+        del self._frame_names[index]
+
+    def _add_tree_item(self, frame_num: int) -> QTreeWidgetItem:
+        """Insert the tree item for a saved frame at its sorted position."""
+        index = self._saved_frame_index(frame_num)
+        frame_item = QTreeWidgetItem()
+        frame_item.setData(0, Qt.UserRole, {"type": "frame", "frame": frame_num})
+        self._tree_root.insertChild(index, frame_item)
+        self._frame_items[frame_num] = frame_item
+        self._decorate_tree_item(frame_item, frame_num, self._frame_names[index])
+        self._sync_frame_children(frame_item, frame_num)
+        frame_item.setExpanded(True)
+        return frame_item
+
+    def _remove_tree_item(self, frame: int) -> None:
+        self._stale_tree_frames.discard(frame)
+        self._child_items.pop(frame, None)
+        frame_item = self._frame_items.pop(frame, None)
+        if frame_item is not None:
+            self._tree_root.removeChild(frame_item)
+
+    def _update_tree_item(self, frame: int) -> None:
+        """Refresh a single saved frame's row and children, adding the row if missing."""
         if not self._tree_root:
             return
-        
-        # Store current selection
-        selected_data = None
-        current = self._frames_tree.currentItem()
-        if current is not None:
-            selected_data = current.data(0, Qt.UserRole)
+        index = self._saved_frame_index(frame)
+        if index is None:
+            self._remove_tree_item(frame)
+            return
+        frame_item = self._frame_items.get(frame)
+        if frame_item is None:
+            self._add_tree_item(frame)
+            return
 
-        self._tree_root.takeChildren()
-        
-        for entry in self._saved_frames:
-            frame_num = entry["frame"]
-            frame_item = QTreeWidgetItem()
-            frame_item.setData(0, Qt.UserRole, {"type": "frame", "frame": frame_num})
-            self._tree_root.addChild(frame_item)
-            self._decorate_tree_item(frame_item, entry)
-            
-            # Add annotations as children of the frame
-            frame_annotations = self._annotations.get(frame_num, [])
-            for annotation in frame_annotations:
-                ann_item = QTreeWidgetItem()
-                ann_item.setData(0, Qt.UserRole, {"type": "annotation", "frame": frame_num, "annotation": annotation})
-                frame_item.addChild(ann_item)
-                self._decorate_annotation_item(ann_item, annotation)
-            
-            # Add mask as a single child if exists
-            if frame_num in self._masks:
-                mask_data = self._masks[frame_num]
-                mask_item = QTreeWidgetItem()
-                mask_item.setData(0, Qt.UserRole, {"type": "mask", "frame": frame_num, "mask": mask_data})
-                frame_item.addChild(mask_item)
-                self._decorate_mask_item(mask_item, mask_data)
-        
-        self._frames_tree.expandAll()
-        
-        # Restore selection
-        if selected_data is not None:
-            self._select_tree_item_by_data(selected_data)
+        tree = self._frames_tree
+        # Already False inside a batch (_flush_tree_updates, a suspended window); leave that to the caller
+        suspend = tree.updatesEnabled()
+        if suspend:
+            tree.setUpdatesEnabled(False)
+        try:
+            self._decorate_tree_item(frame_item, frame, self._frame_names[index])
+            # Expansion is set once when the row is added; keep whatever the user chose since
+            if frame_item.isExpanded():
+                self._sync_frame_children(frame_item, frame)
+            else:
+                # Nobody can see the children; materialize them when the row is expanded
+                self._stale_tree_frames.add(frame)
+                frame_item.setChildIndicatorPolicy(QTreeWidgetItem.ShowIndicator)
+        finally:
+            if suspend:
+                tree.setUpdatesEnabled(True)
+
+    def _schedule_tree_update(self, frame: int) -> None:
+        """Refresh a frame's tree row on the next event loop pass, once per burst of edits."""
+        if not self._pending_tree_frames:
+            QTimer.singleShot(0, self._flush_tree_updates)
+        self._pending_tree_frames.add(frame)
+
+    def _flush_tree_updates(self) -> None:
+        frames = self._pending_tree_frames
+        self._pending_tree_frames = set()
+        # One repaint and no widget signals for the whole burst rather than per frame
+        tree = self._frames_tree
+        suspend = tree.updatesEnabled()
+        if suspend:
+            tree.setUpdatesEnabled(False)
+        tree.blockSignals(True)
+        try:
+            for frame in sorted(frames):
+                self._update_tree_item(frame)
+        finally:
+            tree.blockSignals(False)
+            if suspend:
+                tree.setUpdatesEnabled(True)
+
+    def _sync_frame_children(self, frame_item: QTreeWidgetItem, frame_num: int) -> None:
+        """Diff a frame's child rows against its annotations and mask.
+
+        Rows whose entry still exists are kept as they are (with their decoration and
+        selection); only vanished rows are removed and new entries get a row.
+        """
+        entries: list[tuple[tuple[str, int], dict]] = [
+            ((annotation.type, annotation.id), {"type": "annotation", "frame": frame_num, "annotation": annotation})
+            for annotation in self._annotations.get(frame_num, {}).values()
+        ]
+        mask_data = self._masks.get(frame_num)
+        if mask_data is not None:
+            entries.append((("mask", mask_data["id"]), {"type": "mask", "frame": frame_num, "mask": mask_data}))
+
+        rows = self._child_items.setdefault(frame_num, {})
+        wanted = {key for key, _ in entries}
+        for key in [key for key in rows if key not in wanted]:
+            frame_item.removeChild(rows.pop(key))
+
+        # Entries only ever append (annotations) or sit last (mask), so surviving rows are
+        # already in order and each new row belongs at its entry's position
+        for i, (key, data) in enumerate(entries):
+            if key in rows:
+                continue
+            row = QTreeWidgetItem()
+            row.setData(0, Qt.UserRole, data)
+            frame_item.insertChild(i, row)
+            rows[key] = row
+            if data["type"] == "annotation":
+                self._decorate_annotation_item(row, data["annotation"])
+            else:
+                self._decorate_mask_item(row, mask_data)
 
-    def _decorate_annotation_item(self, item: QTreeWidgetItem, annotation: dict) -> None:
+    def _on_tree_item_expanded(self, item: QTreeWidgetItem) -> None:
+        data = item.data(0, Qt.UserRole)
+        if not isinstance(data, dict) or data.get("type") != "frame":
+            return
+        frame = data["frame"]
+        if frame not in self._stale_tree_frames:
+            return
+        self._stale_tree_frames.discard(frame)
+        item.setChildIndicatorPolicy(QTreeWidgetItem.DontShowIndicatorWhenChildless)
+        self._sync_frame_children(item, frame)
+
+    def _child_row(self, frame: int, key: tuple[str, int]) -> QTreeWidgetItem | None:
+        return self._child_items.get(frame, {}).get(key)
+
+    def _symbol_icon(self, color: QColor, kind: str) -> QIcon:
+        """Return the colored type glyph used as a tree row icon, rendering it once per color."""
+        key = (color.rgba(), kind)
+        icon = self._symbol_icons.get(key)
+        if icon is None:
+            pixmap = QPixmap(16, 16)
+            pixmap.fill(Qt.transparent)
+            painter = QPainter(pixmap)
+            font = painter.font()
+            font.setPixelSize(14)
+            painter.setFont(font)
+            painter.setPen(color)
+            painter.drawText(pixmap.rect(), Qt.AlignCenter, _TREE_SYMBOLS.get(kind, "?"))
+            painter.end()
+            icon = self._symbol_icons[key] = QIcon(pixmap)
+        return icon
+
+    def _decorate_annotation_item(self, item: QTreeWidgetItem, annotation: Annotation) -> None:
         """Style an annotation tree item."""
-        wrapper = QWidget(self._frames_tree)
-        layout = QHBoxLayout(wrapper)
-        layout.setContentsMargins(4, 2, 4, 2)
-        layout.setSpacing(4)
-        
-        ann_type = annotation["type"]
-        ann_id = annotation["id"]
-        ann_name = annotation.get("name")
-        
-        # Type symbol
-        symbols = {"point": "●", "line": "╱", "angle": "∠", "freehand": "◌", "brush": "🖌"}
-        symbol = symbols.get(ann_type, "?")
-        
-        # Color preview for point, line, and angle
-        if ann_type in ("point", "line", "angle"):
-            color_label = QLabel(symbol)
-            color_label.setStyleSheet(f"color: {annotation['color'].name()}; font-size: 14px;")
-            layout.addWidget(color_label)
-        else:
-            symbol_label = QLabel(symbol)
-            layout.addWidget(symbol_label)
-        
-        # Name or default
         type_names = {"point": "Ponto", "line": "Reta", "angle": "Ângulo", "freehand": "Máscara", "brush": "Brush"}
-        display_name = ann_name if ann_name else f"{type_names.get(ann_type, ann_type)} {ann_id}"
-        
-        name_label = QLabel(display_name)
-        if ann_name:
-            font = name_label.font()
-            font.setBold(True)
-            name_label.setFont(font)
-        layout.addWidget(name_label)
-        
-        layout.addStretch()
-        wrapper.setLayout(layout)
-        self._frames_tree.setItemWidget(item, 0, wrapper)
+        ann_type = annotation.type
+        ann_name = annotation.name
+        item.setIcon(0, self._symbol_icon(annotation.color, ann_type))
+        item.setText(0, ann_name if ann_name else f"{type_names.get(ann_type, ann_type)} {annotation.id}")
+        item.setFont(0, self._row_fonts[bool(ann_name)])
 
     def _decorate_mask_item(self, item: QTreeWidgetItem, mask_data: dict) -> None:
         """Style a mask tree item."""
-        wrapper = QWidget(self._frames_tree)
-        layout = QHBoxLayout(wrapper)
-        layout.setContentsMargins(4, 2, 4, 2)
-        layout.setSpacing(4)
-        
         mask_name = mask_data.get("name")
-        mask_color = mask_data.get("color", QColor("yellow"))
-        
-        # Mask symbol with color
-        symbol_label = QLabel("▣")
-        symbol_label.setStyleSheet(f"color: {mask_color.name()}; font-size: 14px;")
-        layout.addWidget(symbol_label)
-        
-        # Name or default
-        display_name = mask_name if mask_name else "Máscara"
-        
-        name_label = QLabel(display_name)
-        if mask_name:
-            font = name_label.font()
-            font.setBold(True)
-            name_label.setFont(font)
-        layout.addWidget(name_label)
-        
-        layout.addStretch()
-        wrapper.setLayout(layout)
-        self._frames_tree.setItemWidget(item, 0, wrapper)
-
-    def _select_tree_item_by_data(self, data) -> None:
-        """Find and select a tree item by its stored data."""
-        def data_matches(stored_data, target_data) -> bool:
-            """Compare data by type and identifiers, not by full equality."""
-            if stored_data is None or target_data is None:
-                return stored_data is target_data
-            if isinstance(stored_data, int) and isinstance(target_data, int):
-                return stored_data == target_data
-            if isinstance(stored_data, dict) and isinstance(target_data, dict):
-                if stored_data.get("type") != target_data.get("type"):
-                    return False
-                if stored_data.get("frame") != target_data.get("frame"):
-                    return False
-                # For annotations, compare by id
-                if stored_data.get("type") == "annotation":
-                    stored_ann = stored_data.get("annotation", {})
-                    target_ann = target_data.get("annotation", {})
-                    return stored_ann.get("id") == target_ann.get("id") and stored_ann.get("type") == target_ann.get("type")
-                # For masks, just match by frame (only one mask per frame)
-                if stored_data.get("type") == "mask":
-                    return True
-                return True
-            return False
-
-        def find_item(parent):
-            for i in range(parent.childCount()):
-                child = parent.child(i)
-                if data_matches(child.data(0, Qt.UserRole), data):
-                    return child
-                found = find_item(child)
-                if found:
-                    return found
-            return None
-        
-        item = find_item(self._tree_root)
-        if item:
-            self._frames_tree.setCurrentItem(item)
-
-    def _decorate_tree_item(self, item: QTreeWidgetItem, entry: dict[str, int | str | None]) -> None:
-        wrapper = QWidget(self._frames_tree)
-        layout = QVBoxLayout(wrapper)
-        layout.setContentsMargins(4, 2, 4, 2)
-        layout.setSpacing(0)
-
-        frame = entry["frame"]
-        name = entry.get("name")
-
-        name_label = QLabel(wrapper)
-        name_label.setText(name if name else f"Frame {frame}")
-        if name:
-            font = name_label.font()
-            font.setBold(True)
-            name_label.setFont(font)
-
-        layout.addWidget(name_label)
+        item.setIcon(0, self._symbol_icon(mask_data.get("color", QColor("yellow")), "mask"))
+        item.setText(0, mask_name if mask_name else "Máscara")
+        item.setFont(0, self._row_fonts[bool(mask_name)])
 
-        if name:
-            frame_label = QLabel(f"Frame {frame}", wrapper)
-            frame_label.setStyleSheet("color: #666666; font-size: 11px;")
-            layout.addWidget(frame_label)
-
-        wrapper.setLayout(layout)
-        self._frames_tree.setItemWidget(item, 0, wrapper)
+    def _decorate_tree_item(self, item: QTreeWidgetItem, frame: int, name: str | None) -> None:
+        # Plain item text is far cheaper than a per-row widget; named rows keep their frame number
+        item.setText(0, f"{name} (Frame {frame})" if name else f"Frame {frame}")
+        item.setToolTip(0, f"Frame {frame}")
+        item.setFont(0, self._row_fonts[bool(name)])
 
     def _on_tree_item_clicked(self, item: QTreeWidgetItem) -> None:
         data = item.data(0, Qt.UserRole)
@@ -1418,8 +1497,9 @@ class MainWindow(QMainWindow):
         
         # Update properties based on item type
         if item_type == "annotation":
-            annotation = data.get("annotation", {})
-            self._update_properties(self._format_annotation_properties(annotation))
+            annotation = data.get("annotation")
+            if annotation is not None:
+                self._update_properties(self._format_annotation_properties(annotation))
         elif item_type == "mask":
             mask = data.get("mask", {})
             self._update_properties(self._format_mask_properties(mask))
@@ -1428,58 +1508,51 @@ class MainWindow(QMainWindow):
         
         self._update_interest_actions_enabled()
 
-    def _format_annotation_properties(self, annotation: dict) -> str:
+    def _format_annotation_properties(self, annotation: Annotation) -> str:
         """Format annotation details for the properties panel."""
-        ann_type = annotation.get("type", "unknown")
+        ann_type = annotation.type
         lines = []
         
         type_names = {"point": "Ponto", "line": "Reta", "angle": "Ângulo", "freehand": "Máscara", "brush": "Brush"}
         lines.append(f"Tipo: {type_names.get(ann_type, ann_type)}")
         
-        if annotation.get("name"):
-            lines.append(f"Nome: {annotation['name']}")
+        if annotation.name:
+            lines.append(f"Nome: {annotation.name}")
         
         if ann_type == "point":
-            lines.append(f"Posição: ({annotation.get('x', 0):.1f}, {annotation.get('y', 0):.1f})")
-            lines.append(f"Tamanho: {annotation.get('size', 3)}")
-            color = annotation.get('color')
-            if color:
-                lines.append(f"Cor: {color.name()}")
+            lines.append(f"Posição: ({annotation.x:.1f}, {annotation.y:.1f})")
+            lines.append(f"Tamanho: {annotation.size}")
+            lines.append(f"Cor: {annotation.color.name()}")
         
         elif ann_type == "line":
-            x1, y1 = annotation.get('x1', 0), annotation.get('y1', 0)
-            x2, y2 = annotation.get('x2', 0), annotation.get('y2', 0)
+            x1, y1 = annotation.x1, annotation.y1
+            x2, y2 = annotation.x2, annotation.y2
             lines.append(f"Início: ({x1:.1f}, {y1:.1f})")
             lines.append(f"Fim: ({x2:.1f}, {y2:.1f})")
-            length = math.sqrt((x2 - x1) ** 2 + (y2 - y1) ** 2)
+            length = math.hypot(x2 - x1, y2 - y1)
             lines.append(f"Comprimento: {length:.1f} px")
-            lines.append(f"Espessura: {annotation.get('width', 2)}")
-            color = annotation.get('color')
-            if color:
-                lines.append(f"Cor: {color.name()}")
+            lines.append(f"Espessura: {annotation.width}")
+            lines.append(f"Cor: {annotation.color.name()}")
         
         elif ann_type == "angle":
-            x1, y1 = annotation.get('x1', 0), annotation.get('y1', 0)
-            x2, y2 = annotation.get('x2', 0), annotation.get('y2', 0)
-            x3, y3 = annotation.get('x3', 0), annotation.get('y3', 0)
+            x1, y1 = annotation.x1, annotation.y1
+            x2, y2 = annotation.x2, annotation.y2
+            x3, y3 = annotation.x3, annotation.y3
             
             lines.append(f"Ponto 1: ({x1:.1f}, {y1:.1f})")
             lines.append(f"Vértice: ({x2:.1f}, {y2:.1f})")
             lines.append(f"Ponto 3: ({x3:.1f}, {y3:.1f})")
             
             # Calculate line lengths
-            len1 = math.sqrt((x2 - x1) ** 2 + (y2 - y1) ** 2)
-            len2 = math.sqrt((x3 - x2) ** 2 + (y3 - y2) ** 2)
+            len1 = math.hypot(x2 - x1, y2 - y1)
+            len2 = math.hypot(x3 - x2, y3 - y2)
             lines.append(f"Comprimento reta 1: {len1:.1f} px")
             lines.append(f"Comprimento reta 2: {len2:.1f} px")
             
-            angle = annotation.get('angle', 0)
-            lines.append(f"Ângulo: {angle:.4f}°")
+            lines.append(f"Ângulo: {annotation.angle:.4f}°")
             
-            lines.append(f"Espessura: {annotation.get('width', 2)}")
-            color = annotation.get('color')
-            if color:
-                lines.append(f"Cor: {color.name()}")
+            lines.append(f"Espessura: {annotation.width}")
+            lines.append(f"Cor: {annotation.color.name()}")
 
         return "\n".join(lines)
 
@@ -1509,24 +1582,34 @@ class MainWindow(QMainWindow):
         
         return "\n".join(lines)
 
-    def _is_supported_video(self, path: Path) -> bool:
-        return path.suffix.lower() in {".mp4", ".avi"}
+    def _is_supported_video(self, path: str | Path) -> bool:
+        return os.path.splitext(path)[1].lower() in _SUPPORTED_SUFFIXES
+
+    def _is_supported_url(self, url) -> bool:
+        # Only the file name matters for the check, so skip building a local path
+        return url.isLocalFile() and self._is_supported_video(url.fileName())
 
     def _handle_drag_enter(self, event) -> bool:
-        if event.mimeData().hasUrls():
-            for url in event.mimeData().urls():
-                if self._is_supported_video(Path(url.toLocalFile())):
-                    event.acceptProposedAction()
-                    return True
+        # DragMove repeats for the same payload at mouse rate; only DragEnter rescans the URLs
+        if event.type() == QEvent.DragEnter:
+            mime = event.mimeData()
+            self._drag_accepted = mime.hasUrls() and any(map(self._is_supported_url, mime.urls()))
+        if self._drag_accepted:
+            event.acceptProposedAction()
+            return True
         event.ignore()
         return False
 
+    def _handle_drag_leave(self) -> None:
+        # The drag session ends here; the next one starts with a fresh DragEnter scan
+        self._drag_accepted = False
+
     def _handle_drop(self, event) -> bool:
+        self._handle_drag_leave()
         if event.mimeData().hasUrls():
             for url in event.mimeData().urls():
-                path = Path(url.toLocalFile())
-                if self._is_supported_video(path):
-                    self._load_video(path)
+                if self._is_supported_url(url):
+                    self._load_video(Path(url.toLocalFile()))
                     event.acceptProposedAction()
                     return True
         event.ignore()
@@ -1542,32 +1625,53 @@ class MainWindow(QMainWindow):
             return
         super().dragMoveEvent(event)
 
+    def dragLeaveEvent(self, event) -> None:
+        self._handle_drag_leave()
+        super().dragLeaveEvent(event)
+
     def dropEvent(self, event) -> None:
         if self._handle_drop(event):
             return
         super().dropEvent(event)
 
+    def showEvent(self, event) -> None:
+        super().showEvent(event)
+        self._flush_hidden_position()
+
+    def changeEvent(self, event) -> None:
+        super().changeEvent(event)
+        if event.type() == QEvent.WindowStateChange and not self.isMinimized():
+            self._flush_hidden_position()
+
+    def _flush_hidden_position(self) -> None:
+        if self._hidden_position_ms is not None and self.isVisible():
+            self._on_position_changed(self._hidden_position_ms)
+
     def _toggle_play_pause(self) -> None:
         if self._player_controller.is_playing():
             self._player_controller.pause()
         else:
             self._player_controller.play()
 
+    def _seek_to_start(self) -> None:
+        self._player_controller.set_position(0)
+
+    def _step_back(self) -> None:
+        self._player_controller.skip_frames(-1)
+
+    def _step_forward(self) -> None:
+        self._player_controller.skip_frames(1)
+
     def configure_shortcuts(self, mapping: dict[str, QKeySequence | str]) -> None:
         """Configure keyboard shortcuts for main actions.
 
         Supported keys in mapping: toggle_play_pause, frame_forward, frame_back.
+        Each shortcut is created once; later calls only rebind its key.
         """
-        actions = {
-            "toggle_play_pause": self._toggle_play_pause,
-            "frame_forward": lambda: self._player_controller.skip_frames(1),
-            "frame_back": lambda: self._player_controller.skip_frames(-1),
-        }
-
-        for key, handler in actions.items():
-            if key not in mapping:
+        for key, sequence in mapping.items():
+            handler = self._shortcut_handlers.get(key)
+            if handler is None:
                 continue
-            sequence = mapping[key]
             if isinstance(sequence, str):
                 sequence = QKeySequence(sequence)
 
@@ -1576,31 +1680,33 @@ class MainWindow(QMainWindow):
                 shortcut = QShortcut(sequence, self)
                 shortcut.activated.connect(handler)
                 self._shortcuts[key] = shortcut
-            else:
+            elif shortcut.key() != sequence:
                 shortcut.setKey(sequence)
 
-    def eventFilter(self, obj, event):
-        if obj is self._video_view and event.type() in (QEvent.DragEnter, QEvent.DragMove, QEvent.Drop):
-            if event.type() in (QEvent.DragEnter, QEvent.DragMove):
-                return self._handle_drag_enter(event)
-            if event.type() == QEvent.Drop:
-                return self._handle_drop(event)
-        return super().eventFilter(obj, event)
-
     def _ms_to_timestamp(self, value_ms: int) -> str:
-        total_seconds = value_ms // 1000
-        minutes = total_seconds // 60
-        seconds = total_seconds % 60
-        millis = value_ms % 1000
+        # Successive ticks share the same second, so only the millis part is rebuilt
+        total_seconds, millis = divmod(value_ms, 1000)
+        if total_seconds != self._timestamp_seconds:
+            self._timestamp_seconds = total_seconds
+            minutes, seconds = divmod(total_seconds, 60)
+            self._timestamp_prefix = f"{minutes:02d}:{seconds:02d}"
+        return f"{self._timestamp_prefix}.{millis:03d}"
+
+    @staticmethod
+    def _format_timestamp(value_ms: int) -> str:
+        total_seconds, millis = divmod(value_ms, 1000)
+        minutes, seconds = divmod(total_seconds, 60)
         return f"{minutes:02d}:{seconds:02d}.{millis:03d}"
 
     def _frame_to_ms(self, frame: int) -> int:
-        if self._frame_rate <= 0:
-            self._frame_rate = 30.0
-        return int(round(frame * (1000.0 / self._frame_rate)))
+        return int(frame * self._ms_per_frame + 0.5)
 
     def _update_properties(self, text: str) -> None:
-        self._prop_view.setPlainText(text)
+        # Skip identical updates; the label would still relayout and repaint
+        if text == self._properties_text:
+            return
+        self._properties_text = text
+        self._prop_view.setText(text)
 
     def _seek_to_end(self) -> None:
         duration = self._position_slider.maximum()
@@ -1621,28 +1727,36 @@ class MainWindow(QMainWindow):
         if isinstance(data, int):
             # Old format - frame only
             frame = data
-            entry = next((e for e in self._saved_frames if e["frame"] == frame), None)
-            if entry is None:
+            index = self._saved_frame_index(frame)
+            if index is None:
                 return
-            current_name = entry.get("name") or ""
+            current_name = self._frame_names[index] or ""
             name, ok = QInputDialog.getText(self, "Renomear frame", "Nome:", text=current_name)
             if not ok:
                 return
-            entry["name"] = name.strip() or None
-            self._rebuild_frames_tree()
+            # The dialog spins the event loop, so the frame may have been cleared meanwhile
+            index = self._saved_frame_index(frame)
+            if index is None:
+                return
+            self._frame_names[index] = name.strip() or None
+            self._decorate_tree_item(self._frame_items[frame], frame, self._frame_names[index])
             self._update_interest_actions_enabled()
             
         elif data.get("type") == "frame":
             frame = data["frame"]
-            entry = next((e for e in self._saved_frames if e["frame"] == frame), None)
-            if entry is None:
+            index = self._saved_frame_index(frame)
+            if index is None:
                 return
-            current_name = entry.get("name") or ""
+            current_name = self._frame_names[index] or ""
             name, ok = QInputDialog.getText(self, "Renomear frame", "Nome:", text=current_name)
             if not ok:
                 return
-            entry["name"] = name.strip() or None
-            self._rebuild_frames_tree()
+            # The dialog spins the event loop, so the frame may have been cleared meanwhile
+            index = self._saved_frame_index(frame)
+            if index is None:
+                return
+            self._frame_names[index] = name.strip() or None
+            self._decorate_tree_item(self._frame_items[frame], frame, self._frame_names[index])
             self._update_interest_actions_enabled()
             
         elif data.get("type") == "annotation":
@@ -1652,31 +1766,26 @@ class MainWindow(QMainWindow):
                 return
             
             # Find the annotation in self._annotations by id and type
-            ann_id = annotation_data.get("id")
-            ann_type = annotation_data.get("type")
-            
-            frame_annotations = self._annotations.get(frame, [])
-            annotation = next(
-                (a for a in frame_annotations if a.get("id") == ann_id and a.get("type") == ann_type),
-                None
-            )
+            ann_id = annotation_data.id
+            ann_type = annotation_data.type
+            annotation = self._annotations.get(frame, {}).get((ann_type, ann_id))
             
             if annotation is None:
                 return
             
-            current_name = annotation.get("name") or ""
+            current_name = annotation.name or ""
             type_names = {"point": "Ponto", "line": "Reta", "angle": "Ângulo", "freehand": "Máscara", "brush": "Brush"}
             type_label = type_names.get(ann_type, "Item")
             name, ok = QInputDialog.getText(self, f"Renomear {type_label.lower()}", "Nome:", text=current_name)
             if not ok:
                 return
             
-            annotation["name"] = name.strip() or None
+            annotation.name = name.strip() or None
             
-            # Rebuild and reselect
-            self._rebuild_frames_tree()
-            
-            # Manually select the renamed item
+            # Only the renamed row changes; redecorate it in place and reselect
+            row = self._child_row(frame, (ann_type, ann_id))
+            if row is not None:
+                self._decorate_annotation_item(row, annotation)
             self._select_annotation_in_tree(frame, ann_id, ann_type)
             self._update_interest_actions_enabled()
         
@@ -1692,26 +1801,16 @@ class MainWindow(QMainWindow):
                 return
             
             mask["name"] = name.strip() or None
-            self._rebuild_frames_tree()
+            row = self._child_row(frame, ("mask", mask["id"]))
+            if row is not None:
+                self._decorate_mask_item(row, mask)
             self._update_interest_actions_enabled()
 
     def _select_annotation_in_tree(self, frame: int, ann_id: int, ann_type: str) -> None:
         """Select a specific annotation in the tree by its identifiers."""
-        if not self._tree_root:
-            return
-        
-        for i in range(self._tree_root.childCount()):
-            frame_item = self._tree_root.child(i)
-            frame_data = frame_item.data(0, Qt.UserRole)
-            if isinstance(frame_data, dict) and frame_data.get("frame") == frame:
-                for j in range(frame_item.childCount()):
-                    ann_item = frame_item.child(j)
-                    ann_data = ann_item.data(0, Qt.UserRole)
-                    if isinstance(ann_data, dict) and ann_data.get("type") == "annotation":
-                        annotation = ann_data.get("annotation", {})
-                        if annotation.get("id") == ann_id and annotation.get("type") == ann_type:
-                            self._frames_tree.setCurrentItem(ann_item)
-                            return
+        row = self._child_row(frame, (ann_type, ann_id))
+        if row is not None:
+            self._frames_tree.setCurrentItem(row)
 
     def _delete_selected_frame(self) -> None:
         item = self._frames_tree.currentItem()
@@ -1724,35 +1823,42 @@ class MainWindow(QMainWindow):
         # Handle both old format (int) and new format (dict)
         if isinstance(data, int):
             frame = data
-            self._saved_frames = [e for e in self._saved_frames if e["frame"] != frame]
+            self._remove_saved_frame(frame)
+            self._remove_tree_item(frame)
             if frame in self._annotations:
                 del self._annotations[frame]
             if frame in self._masks:
                 del self._masks[frame]
+            self._touch_overlays(frame)
         elif data.get("type") == "frame":
             frame = data["frame"]
-            self._saved_frames = [e for e in self._saved_frames if e["frame"] != frame]
+            self._remove_saved_frame(frame)
+            self._remove_tree_item(frame)
             if frame in self._annotations:
                 del self._annotations[frame]
             if frame in self._masks:
                 del self._masks[frame]
+            self._touch_overlays(frame)
         elif data.get("type") == "annotation":
             frame = data["frame"]
             annotation = data.get("annotation")
-            if frame in self._annotations and annotation in self._annotations[frame]:
-                self._annotations[frame].remove(annotation)
+            frame_annotations = self._annotations.get(frame)
+            if frame_annotations is not None and annotation is not None:
+                frame_annotations.pop((annotation.type, annotation.id), None)
+            self._update_tree_item(frame)
+            self._touch_overlays(frame)
         elif data.get("type") == "mask":
             frame = data["frame"]
             if frame in self._masks:
                 del self._masks[frame]
+            self._update_tree_item(frame)
+            self._touch_overlays(frame)
         
-        self._rebuild_frames_tree()
         self._update_interest_actions_enabled()
         self._update_properties("Nenhum item selecionado")
         
         # Update video view
-        self._video_view.set_annotations(self._annotations.get(self._current_frame, []))
-        self._video_view.set_mask(self._masks.get(self._current_frame))
+        self._push_overlays()
 
     def _has_selected_interest(self) -> bool:
         item = self._frames_tree.currentItem()
@@ -1769,19 +1875,16 @@ class MainWindow(QMainWindow):
     def _update_interest_actions_enabled(self) -> None:
         selected = self._frames_tree.currentItem()
         has_frame = bool(selected and selected.data(0, Qt.UserRole) is not None)
+        if has_frame == self._interest_actions_enabled:
+            return
+        self._interest_actions_enabled = has_frame
         self._edit_frame_btn.setEnabled(has_frame)
         self._delete_frame_btn.setEnabled(has_frame)
 
     def _handle_invalid_media(self) -> None:
         self._media_loaded = False
         self._fit_pending = False
-        self._saved_frames.clear()
-        self._annotations.clear()
-        self._masks.clear()
-        if self._tree_root:
-            self._tree_root.takeChildren()
-        self._update_properties("Nenhum item selecionado")
-        self._update_controls_enabled(False)
+        self._reset_after_failed_load()
         QMessageBox.warning(
             self,
             "Vídeo inválido",
@@ -1,11 +1,69 @@
 from __future__ import annotations
 
+import hashlib
+import json
+import os
+import tempfile
+from collections import OrderedDict
 from pathlib import Path
 from typing import Callable, Optional
 
-from PySide6.QtCore import QObject, QUrl, Signal
+from PySide6.QtCore import QObject, QThreadPool, QTimer, QUrl, Signal
 from PySide6.QtMultimedia import QAudioOutput, QMediaMetaData, QMediaPlayer
 
+_NO_ERROR = QMediaPlayer.NoError  # PySide6 enums are plain Enum; compare members, never int()
+_PLAYING_STATE = QMediaPlayer.PlayingState
+_FRAME_RATE_KEY = getattr(QMediaMetaData, "VideoFrameRate", None)
+_POSITION_COALESCE_MS = 16  # forward at most ~60 position updates per second
+_META_CACHE_LIMIT = 256  # files remembered; the least recently opened are dropped first
+
+
+def _noop(*_args) -> None:
+    return None
+
+
+def _load_meta_cache(path: Path) -> OrderedDict[str, dict]:
+    """Read the probed-metadata cache, oldest first; a missing or corrupt file starts an empty one."""
+    try:
+        with path.open(encoding="utf-8") as handle:
+            data = json.load(handle)
+    except (OSError, ValueError):
+        return OrderedDict()
+    if not isinstance(data, dict):
+        return OrderedDict()
+    return OrderedDict(list(data.items())[-_META_CACHE_LIMIT:])
+
+
+def _write_meta_cache(path: Path, entries: dict[str, dict]) -> None:
+    """Replace the cache file atomically, so an interrupted write never leaves broken JSON."""
+    payload = json.dumps(entries)
+    try:
+        fd, tmp_name = tempfile.mkstemp(prefix=path.name, suffix=".tmp", dir=path.parent)
+    except OSError:
+        # Best-effort; the next load simply probes the backend again.
+        return
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as handle:
+            handle.write(payload)
+        os.replace(tmp_name, path)
+    except OSError:
+        try:
+            os.unlink(tmp_name)
+        except OSError:
+            pass
+
+
+_meta_writer_pool: Optional[QThreadPool] = None
+
+
+def _meta_writer() -> QThreadPool:
+    """Single-thread pool shared by all controllers, so cache writes land in submission order."""
+    global _meta_writer_pool
+    if _meta_writer_pool is None:
+        _meta_writer_pool = QThreadPool()
+        _meta_writer_pool.setMaxThreadCount(1)
+    return _meta_writer_pool
+
 
 class VideoPlayerController(QObject):
     """Small wrapper around QMediaPlayer to centralize playback logic."""
@@ -23,20 +81,44 @@ class VideoPlayerController(QObject):
         self,
         parent: Optional[QObject] = None,
         player_factory: Optional[Callable[[QObject], QMediaPlayer]] = None,
+        meta_cache_path: Optional[Path] = None,
     ) -> None:
         super().__init__(parent)
         self._player = (player_factory or QMediaPlayer)(self)
         self._audio_output = QAudioOutput(self)
         if hasattr(self._player, "setAudioOutput"):
             self._player.setAudioOutput(self._audio_output)
+        # Resolve the hot player calls once; injected players may lack some of them
+        self._play = getattr(self._player, "play", _noop)
+        self._pause = getattr(self._player, "pause", _noop)
+        self._playback_state = getattr(self._player, "playbackState", _noop)
+        self._get_position = self._player.position
+        self._set_position = self._player.setPosition
+        self._set_loops = getattr(self._player, "setLoops", None)
         self._frame_interval_ms: float = 1000.0 / self._DEFAULT_FRAME_RATE
+        self._step_ms: dict[int, int] = {}  # frame_offset -> whole-ms delta at the current rate
+        self._duration_ms: int = 0  # Mirrors durationChanged so skip_frames avoids querying the player
+        self._position_ms: int = 0  # Mirrors positionChanged and our own seeks, for the same reason
         self._current_path: Optional[Path] = None
+        self._url_cache: dict[str, QUrl] = {}  # str(path) -> local file URL, for reloads
         self._loop_enabled: bool = False
         self._pending_seek_position: Optional[int] = None  # Track pending seek for play fix
         self._first_frame_shown: bool = False  # Track if first frame was displayed
+        # Frame rates probed on earlier opens, keyed by a hash of "path:mtime_ns:size", so a
+        # reopened file can step frames before the backend finishes loading it
+        self._meta_cache_path = meta_cache_path or Path.home() / ".mleditor_meta.json"
+        self._meta_cache: OrderedDict[str, dict] = _load_meta_cache(self._meta_cache_path)
+        self._meta_key: Optional[str] = None
+        # High-fps sources tick positionChanged faster than the UI can usefully redraw;
+        # only the latest position within each window is forwarded
+        self._pending_position: int = 0
+        self._position_timer = QTimer(self)
+        self._position_timer.setSingleShot(True)
+        self._position_timer.setInterval(_POSITION_COALESCE_MS)
+        self._position_timer.timeout.connect(self._flush_position)
 
-        self._player.positionChanged.connect(self.position_changed.emit)
-        self._player.durationChanged.connect(self.duration_changed.emit)
+        self._player.positionChanged.connect(self._on_raw_position)
+        self._player.durationChanged.connect(self._handle_duration_changed)
         self._player.playbackStateChanged.connect(self.playback_state_changed.emit)
         self._player.mediaStatusChanged.connect(self._handle_media_status)
         self._player.errorOccurred.connect(self._handle_error)
@@ -58,35 +140,49 @@ class VideoPlayerController(QObject):
 
     def load(self, file_path: str | Path) -> None:
         """Load a local video file."""
-        self._current_path = Path(file_path)
+        path = file_path if isinstance(file_path, Path) else Path(file_path)
+        self._current_path = path
         self._first_frame_shown = False  # Reset flag for new video
         self._pending_seek_position = None
+        # The player reports 0 for both right after setSource; don't step through the old file's range
+        self._duration_ms = 0
+        self._position_ms = 0
+        # A coalesced tick from the previous file must not reach the new file's slider
+        self._position_timer.stop()
+        self._pending_position = 0
+        self._meta_key = self._cache_key(path)
+        cached = self._meta_cache.get(self._meta_key) if self._meta_key else None
+        if cached and cached.get("fps", 0) > 0:
+            self._meta_cache.move_to_end(self._meta_key)
+            self._set_frame_rate(float(cached["fps"]))
         if hasattr(self._player, "setSource"):
-            self._player.setSource(QUrl.fromLocalFile(str(self._current_path)))
+            key = str(path)
+            url = self._url_cache.get(key)
+            if url is None:
+                url = self._url_cache[key] = QUrl.fromLocalFile(key)
+            self._player.setSource(url)
         self._apply_loop_setting()
 
     def play(self) -> None:
-        if hasattr(self._player, "play"):
-            # If there was a pending seek while paused, re-apply it after starting play
-            # This fixes the black screen issue after seek + play
-            if self._pending_seek_position is not None:
-                target_position = self._pending_seek_position
-                self._pending_seek_position = None
-                self._player.play()
-                # Re-apply the position after play starts to ensure proper rendering
-                self._player.setPosition(target_position)
-            else:
-                self._player.play()
+        # If there was a pending seek while paused, re-apply it after starting play
+        # This fixes the black screen issue after seek + play
+        if self._pending_seek_position is not None:
+            target_position = self._pending_seek_position
+            self._pending_seek_position = None
+            self._play()
+            # Re-apply the position after play starts to ensure proper rendering
+            self._seek(target_position)
+        else:
+            self._play()
 
     def pause(self) -> None:
-        if hasattr(self._player, "pause"):
-            self._player.pause()
+        self._pause()
 
     def set_position(self, position_ms: int) -> None:
         """Seek to the requested position in milliseconds."""
         if position_ms < 0:
             position_ms = 0
-        self._player.setPosition(position_ms)
+        self._seek(position_ms)
         # Track the seek position in case we need to re-apply it on play
         # This helps fix black screen issues after seek while paused
         if not self.is_playing():
@@ -94,42 +190,68 @@ class VideoPlayerController(QObject):
 
     def skip_frames(self, frame_offset: int) -> None:
         """Move forward/backward by a number of frames, respecting video duration."""
-        if frame_offset == 0 or self._player.duration() <= 0:
+        duration = self._duration_ms
+        if frame_offset == 0 or duration <= 0:
             return
 
-        delta_ms = int(frame_offset * self._frame_interval_ms)
-        new_position = max(0, min(self._player.duration(), self._player.position() + delta_ms))
-        self._player.setPosition(new_position)
+        # Scrubbing repeats the same few offsets, so each delta is computed once per frame rate
+        delta_ms = self._step_ms.get(frame_offset)
+        if delta_ms is None:
+            delta_ms = self._step_ms[frame_offset] = int(frame_offset * self._frame_interval_ms)
+        new_position = max(0, min(duration, self._position_ms + delta_ms))
+        self._seek(new_position)
         # Track the seek position in case we need to re-apply it on play
         if not self.is_playing():
             self._pending_seek_position = new_position
 
     def is_playing(self) -> bool:
-        if hasattr(self._player, "playbackState"):
-            return self._player.playbackState() == QMediaPlayer.PlayingState
-        return False
+        return self._playback_state() == _PLAYING_STATE
 
     def set_looping(self, enabled: bool) -> None:
         self._loop_enabled = enabled
         self._apply_loop_setting()
 
+    def _seek(self, position_ms: int) -> None:
+        self._position_ms = position_ms
+        self._set_position(position_ms)
+
+    def _on_raw_position(self, position_ms: int) -> None:
+        self._position_ms = position_ms
+        self._pending_position = position_ms
+        if not self._position_timer.isActive():
+            self._position_timer.start()
+
+    def _flush_position(self) -> None:
+        self.position_changed.emit(self._pending_position)
+
+    def _handle_duration_changed(self, duration_ms: int) -> None:
+        self._duration_ms = duration_ms
+        self.duration_changed.emit(duration_ms)
+
     def _handle_media_status(self, status: QMediaPlayer.MediaStatus) -> None:
         self.media_status_changed.emit(status)
         if status in (
             QMediaPlayer.MediaStatus.BufferedMedia,
             QMediaPlayer.MediaStatus.LoadedMedia,
         ):
-            self._update_frame_interval()
+            probed_rate = self._update_frame_interval()
+            if status == QMediaPlayer.MediaStatus.LoadedMedia:
+                if probed_rate is not None:
+                    # The 30 fps fallback is a guess; caching it would outlive a later real probe
+                    self._remember_frame_rate(probed_rate)
+                # Seed the mirrors once in case the backend reported either before we connected
+                self._duration_ms = self._player.duration()
+                self._position_ms = self._get_position()
             # Show first frame when video is loaded
             if not self._first_frame_shown:
                 self._show_first_frame()
         elif status == QMediaPlayer.MediaStatus.EndOfMedia:
             if not self._loop_enabled:
                 # Stop at the last frame instead of looping back.
-                duration = self._player.duration()
+                duration = self._duration_ms
                 if duration > 0:
-                    self._player.setPosition(duration)
-                self._player.pause()
+                    self._seek(duration)
+                self._pause()
 
     def _show_first_frame(self) -> None:
         """Display the first frame of the video by doing a quick play/pause."""
@@ -137,44 +259,71 @@ class VideoPlayerController(QObject):
             return
         self._first_frame_shown = True
         # Play and immediately pause to render the first frame
-        if hasattr(self._player, "play") and hasattr(self._player, "pause"):
-            self._player.play()
-            self._player.pause()
-            self._player.setPosition(0)
+        if self._play is not _noop and self._pause is not _noop:
+            self._play()
+            self._pause()
+            self._seek(0)
             self._pending_seek_position = None  # Clear any pending seek
 
     def _handle_error(self, error: QMediaPlayer.Error, error_string: str) -> None:
-        if error != QMediaPlayer.NoError:
+        if error != _NO_ERROR:
             message = error_string or "Erro ao carregar o vídeo."
             self.error_occurred.emit(message)
 
-    def _update_frame_interval(self) -> None:
-        """Derive frame interval from metadata. Fallback to a sensible default."""
+    def _update_frame_interval(self) -> Optional[float]:
+        """Derive frame interval from metadata. Fallback to a sensible default.
+
+        Returns the metadata frame rate, or None when the default was applied.
+        """
         metadata = self._player.metaData()
         frame_rate_value = None
 
-        if metadata is not None:
-            try:
-                frame_rate_value = metadata.value(QMediaMetaData.VideoFrameRate)
-            except AttributeError:
-                # Older PySide6 versions expose metadata differently; ignore and fallback.
-                frame_rate_value = None
+        # Older PySide6 versions expose metadata differently; ignore and fallback.
+        if metadata is not None and _FRAME_RATE_KEY is not None:
+            frame_rate_value = metadata.value(_FRAME_RATE_KEY)
+
+        probed_rate = float(frame_rate_value) if frame_rate_value else None
+        if probed_rate is not None and probed_rate <= 0:
+            probed_rate = None
 
-        frame_rate = float(frame_rate_value) if frame_rate_value else self._DEFAULT_FRAME_RATE
-        if frame_rate <= 0:
-            frame_rate = self._DEFAULT_FRAME_RATE
+        self._set_frame_rate(self._DEFAULT_FRAME_RATE if probed_rate is None else probed_rate)
+        return probed_rate
 
+    def _set_frame_rate(self, frame_rate: float) -> None:
         self._frame_interval_ms = 1000.0 / frame_rate
+        self._step_ms.clear()
         self.frame_rate_changed.emit(frame_rate)
 
+    @staticmethod
+    def _cache_key(path: Path) -> Optional[str]:
+        try:
+            stat = path.stat()
+        except OSError:
+            return None
+        # Hashed, so the cache file does not record where the user's videos live
+        raw = f"{os.path.abspath(path)}:{stat.st_mtime_ns}:{stat.st_size}"
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def _remember_frame_rate(self, frame_rate: float) -> None:
+        """Store the probed frame rate for the current file and persist it off the GUI thread."""
+        key = self._meta_key
+        cache = self._meta_cache
+        if key is None or cache.get(key, {}).get("fps") == frame_rate:
+            return
+        cache[key] = {"fps": frame_rate}
+        cache.move_to_end(key)
+        while len(cache) > _META_CACHE_LIMIT:
+            cache.popitem(last=False)
+        # The worker dumps a snapshot; entries are replaced, never mutated, so a shallow copy will do
+        snapshot = dict(cache)
+        path = self._meta_cache_path
+        _meta_writer().start(lambda: _write_meta_cache(path, snapshot))
+
     def _apply_loop_setting(self) -> None:
         """Apply looping preference if backend supports it."""
-        if hasattr(self._player, "setLoops"):
+        if self._set_loops is not None:
             try:
-                if self._loop_enabled:
-                    self._player.setLoops(QMediaPlayer.Infinite)
-                else:
-                    self._player.setLoops(1)
+                self._set_loops(QMediaPlayer.Infinite if self._loop_enabled else 1)
             except Exception:
                 # Best-effort; fallback will be handled via EndOfMedia.
                 return
\ No newline at end of file
@@ -1,18 +1,109 @@
 from __future__ import annotations
 
 import math
+from typing import Callable
 
-from PySide6.QtCore import Qt, Signal, QPointF, QRectF
-from PySide6.QtGui import QPainter, QTransform, QBrush, QPen, QColor, QPainterPath
+from PySide6.QtCore import Qt, Signal, QPointF, QRectF, QTimer
+from PySide6.QtGui import QPainter, QTransform, QBrush, QPen, QColor, QCursor, QOpenGLContext, QPainterPath
 from PySide6.QtMultimediaWidgets import QGraphicsVideoItem
+from PySide6.QtOpenGLWidgets import QOpenGLWidget
 from PySide6.QtWidgets import (
     QGraphicsScene,
     QGraphicsView,
     QGraphicsEllipseItem,
+    QGraphicsItem,
     QGraphicsLineItem,
     QGraphicsPathItem,
 )
 
+from .annotations import AngleAnnotation, Annotation, LineAnnotation, PointAnnotation
+
+# Absolute view scale per wheel notch, clamped to [0.2, 8.0]; stepping between integer
+# levels keeps repeated zooming from accumulating rounding error
+_ZOOM_MIN_LEVEL = -12
+_ZOOM_MAX_LEVEL = 15
+_ZOOM_TABLE: tuple[float, ...] = tuple(
+    max(0.2, min(8.0, 1.15 ** level)) for level in range(_ZOOM_MIN_LEVEL, _ZOOM_MAX_LEVEL + 1)
+)
+_ZOOM_COALESCE_MS = 16  # trackpads send many wheel events per frame; scale at most once per frame
+_PREVIEW_COALESCE_MS = 16  # rebuild line/angle previews at most once per display frame
+
+
+def _opengl_available() -> bool:
+    """Whether the platform can create an OpenGL context for the viewport."""
+    return QOpenGLContext().create()
+
+
+class _PointOverlay(QGraphicsItem):
+    """Every point marker of a frame, painted by one item at a fixed on-screen size."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._groups: list[tuple[QBrush, list[tuple[float, float, float]]]] = []
+        self._bounds = QRectF()  # Scene-space box around the marker centres
+        self._max_half = 0.0  # Largest marker radius, in device pixels
+        self._view_scale = 1.0
+        self.setZValue(100)
+        self.setAcceptedMouseButtons(Qt.NoButton)
+        # Video frames repaint underneath; the markers are only re-rasterized when they change
+        self.setCacheMode(QGraphicsItem.DeviceCoordinateCache)
+
+    def set_points(self, points: list[PointAnnotation]) -> None:
+        """Replace the markers, batching them by colour so each brush is set once per paint."""
+        self.prepareGeometryChange()
+        groups: dict[int, tuple[QBrush, list[tuple[float, float, float]]]] = {}
+        max_half = 0.0
+        left = top = math.inf
+        right = bottom = -math.inf
+        # One pass groups the markers and accumulates their bounds
+        for point in points:
+            key = point.color.rgba()
+            group = groups.get(key)
+            if group is None:
+                group = groups[key] = (QBrush(point.color), [])
+            x = point.x
+            y = point.y
+            half = point.size / 2
+            group[1].append((x, y, half))
+            if half > max_half:
+                max_half = half
+            if x < left:
+                left = x
+            if x > right:
+                right = x
+            if y < top:
+                top = y
+            if y > bottom:
+                bottom = y
+        self._groups = list(groups.values())
+        self._max_half = max_half
+        self._bounds = QRectF(left, top, right - left, bottom - top) if points else QRectF()
+        self.update()
+
+    def set_view_scale(self, scale: float) -> None:
+        """Track the view scale so the bounds cover markers that do not zoom with the video."""
+        if scale > 0 and scale != self._view_scale:
+            self.prepareGeometryChange()
+            self._view_scale = scale
+
+    def boundingRect(self) -> QRectF:
+        if not self._groups:
+            return QRectF()
+        margin = self._max_half / self._view_scale + 1
+        return self._bounds.adjusted(-margin, -margin, margin, margin)
+
+    def paint(self, painter, _option, _widget=None) -> None:
+        if not self._groups:
+            return
+        # Draw in device pixels so marker sizes ignore the zoom, like ItemIgnoresTransformations
+        transform = painter.worldTransform()
+        painter.resetTransform()
+        painter.setPen(Qt.NoPen)
+        for brush, dots in self._groups:
+            painter.setBrush(brush)
+            for x, y, half in dots:
+                painter.drawEllipse(transform.map(QPointF(x, y)), half, half)
+
 
 class VideoView(QGraphicsView):
     """Graphics-based video view with zoom and pan support."""
@@ -26,29 +117,77 @@ class VideoView(QGraphicsView):
     freehand_completed = Signal(object)  # Emits QPainterPath for freehand shape
     brush_stroke_completed = Signal(object)  # Emits QPainterPath for brush stroke
 
+    # Drag-and-drop signals; receivers accept or ignore the forwarded event
+    drag_entered = Signal(object)  # Emits QDragEnterEvent/QDragMoveEvent
+    drag_left = Signal()  # The drag left the view without dropping
+    dropped = Signal(object)  # Emits QDropEvent
+
+    _DEFAULT_MASK_COLOR = QColor("yellow")  # Shared fallback; dict.get would build one per call
+
     def __init__(self, parent=None) -> None:
         super().__init__(parent)
+        # The update mode is fixed per viewport instead of switched on annotation count:
+        # points, the dense case, all paint through one _PointOverlay, so many annotations
+        # no longer mean many dirty rects
+        if _opengl_available():
+            # Composite the video frame and overlays on the GPU instead of the raster engine;
+            # the view takes ownership of the viewport widget
+            self.setViewport(QOpenGLWidget())
+            # A GL viewport redraws the whole framebuffer anyway, so skip computing dirty regions
+            self.setViewportUpdateMode(QGraphicsView.FullViewportUpdate)
+        else:
+            # No GL (remote sessions, headless platforms): a QOpenGLWidget would stay blank,
+            # so keep the raster viewport, where only the video item's rect needs repainting
+            self.setViewportUpdateMode(QGraphicsView.BoundingRectViewportUpdate)
         self._scene = QGraphicsScene(self)
+        # A handful of overlay items; maintaining a BSP index for them costs more than it saves
+        self._scene.setItemIndexMethod(QGraphicsScene.NoIndex)
         self._video_item = QGraphicsVideoItem()
         self._scene.addItem(self._video_item)
         self.setScene(self._scene)
+        # Clicks and drags map through these instead of asking the item each event
+        self._video_rect: tuple[float, float, float, float] = (0.0, 0.0, 0.0, 0.0)  # left, top, right, bottom
+        # m11, m21, dx, m12, m22, dy; None while the item sits untransformed at the scene origin
+        self._scene_to_video: tuple[float, ...] | None = None
+        self._refresh_video_geometry()
+        self._video_item.nativeSizeChanged.connect(self._refresh_video_geometry)
         self.setRenderHints(QPainter.Antialiasing | QPainter.SmoothPixmapTransform)
+        # Every item sets its own pen and brush, so saving painter state around each one is wasted
+        self.setOptimizationFlag(QGraphicsView.DontSavePainterState, True)
         self.setTransformationAnchor(QGraphicsView.AnchorUnderMouse)
         self.setResizeAnchor(QGraphicsView.AnchorUnderMouse)
 
-        self._zoom = 1.0
-        self._zoom_min = 0.2
-        self._zoom_max = 8.0
+        self._zoom_level = 0  # Level requested by wheel events
+        self._applied_zoom_level = 0  # Level the view transform currently reflects
+        self._zoom_timer = QTimer(self)
+        self._zoom_timer.setSingleShot(True)
+        self._zoom_timer.setInterval(_ZOOM_COALESCE_MS)
+        self._zoom_timer.timeout.connect(self._apply_pending_zoom)
         self._hand_enabled = False
+        # Built once; pan gestures swap between these on every press and release
+        self._open_cursor = QCursor(Qt.OpenHandCursor)
+        self._closed_cursor = QCursor(Qt.ClosedHandCursor)
+        self._arrow_cursor = QCursor(Qt.ArrowCursor)
 
         self.setDragMode(QGraphicsView.NoDrag)
         self.setAcceptDrops(True)
         self.setMouseTracking(True)  # Enable mouse tracking for brush preview
 
+        # Cosmetic pens by (rgba, width); annotations and previews reuse a handful of styles
+        self._pen_cache: dict[tuple[int, int], QPen] = {}
+
         # Annotation management
-        self._annotations: list[dict] = []
-        self._annotation_items: list = []  # Can hold ellipses, lines, etc.
-        self._annotation_mode: bool = False
+        # Records compare by identity, so an equal tuple means the same records are shown
+        self._annotations: tuple[Annotation, ...] = ()
+        self._point_overlay = _PointOverlay()
+        self._scene.addItem(self._point_overlay)
+        # Pooled line items, reused across frames; entries past the ones in use are hidden
+        self._line_items: list[QGraphicsLineItem] = []
+        # Annotation type -> drawer that fills pooled lines from a slot and returns the next one
+        self._line_drawers: dict[str, Callable[[Annotation, int], int]] = {
+            "line": self._draw_line,
+            "angle": self._draw_angle,
+        }
         
         # Current tool mode
         self._current_tool: str = "selection"  # "selection", "hand", "point", "line", "angle", "freehand", "brush"
@@ -63,10 +202,21 @@ class VideoView(QGraphicsView):
         
         # Angle drawing state
         self._angle_points: list[QPointF] = []  # Stores p1, p2, then p3
-        self._angle_preview_lines: list[QGraphicsLineItem] = []  # Preview lines
+        self._angle_preview_lines: list[QGraphicsLineItem] = []  # Preview arms, hidden when idle
         self._angle_preview_color: QColor = QColor("yellow")
         self._angle_preview_width: int = 2
+        self._angle_preview_pen: QPen = self._get_pen(self._angle_preview_color, self._angle_preview_width)
+        self._last_preview_angle: float = -1.0  # Last value sent on angle_preview_changed
         self._shift_pressed: bool = False
+        self._perp_axis: tuple[float, float, float, float] | None = None  # p2 x, y and unit perpendicular
+
+        # Mice report moves far faster than the screen refreshes; previews track the latest one
+        self._pending_preview: tuple[float, float] = (0.0, 0.0)
+        self._last_preview_end: tuple[float, float] | None = None  # End point last drawn, to skip sub-pixel moves
+        self._preview_timer = QTimer(self)
+        self._preview_timer.setSingleShot(True)
+        self._preview_timer.setInterval(_PREVIEW_COALESCE_MS)
+        self._preview_timer.timeout.connect(self._flush_preview)
         
         # Freehand drawing state
         self._freehand_points: list[QPointF] = []
@@ -85,8 +235,14 @@ class VideoView(QGraphicsView):
         self._brush_is_drawing: bool = False
         self._brush_last_point: QPointF | None = None
         
-        # Mask display
-        self._mask_item: QGraphicsPathItem | None = None
+        # Mask display; one persistent item, re-pathed or hidden as frames change
+        self._mask_item = QGraphicsPathItem()
+        self._mask_item.setBrush(Qt.NoBrush)
+        self._mask_item.setZValue(100)
+        # Brush masks are unions of many circles; rasterize the outline once, not every repaint
+        self._mask_item.setCacheMode(QGraphicsItem.DeviceCoordinateCache)
+        self._mask_item.setVisible(False)
+        self._scene.addItem(self._mask_item)
 
     @property
     def video_item(self) -> QGraphicsVideoItem:
@@ -94,20 +250,24 @@ class VideoView(QGraphicsView):
 
     def reset_view(self) -> bool:
         """Fit the video in view and reset user zoom factor. Returns True if applied."""
-        self._zoom = 1.0
+        self._zoom_timer.stop()
+        self._zoom_level = 0
+        self._applied_zoom_level = 0
         self.setTransform(QTransform())
+        self._refresh_video_geometry()
         rect = self._video_item.boundingRect()
         if rect.isEmpty():
+            self._point_overlay.set_view_scale(1.0)
             return False
         self._fix_scene_rect()
         self.fitInView(self._video_item, Qt.KeepAspectRatio)
+        self._point_overlay.set_view_scale(self.transform().m11())
         return True
 
     def set_hand_mode(self, enabled: bool) -> None:
         self._hand_enabled = enabled
         self.setDragMode(QGraphicsView.ScrollHandDrag if enabled else QGraphicsView.NoDrag)
-        cursor = Qt.OpenHandCursor if enabled else Qt.ArrowCursor
-        self.viewport().setCursor(cursor)
+        self.viewport().setCursor(self._open_cursor if enabled else self._arrow_cursor)
 
     def set_current_tool(self, tool: str) -> None:
         """Set the current tool and cancel any in-progress drawing."""
@@ -132,6 +292,9 @@ class VideoView(QGraphicsView):
         """Set the style for angle preview."""
         self._angle_preview_color = color
         self._angle_preview_width = width
+        self._angle_preview_pen = self._get_pen(color, width)
+        for item in self._angle_preview_lines:
+            item.setPen(self._angle_preview_pen)
 
     def set_freehand_style(self, color: QColor, width: int) -> None:
         """Set the style for freehand drawing."""
@@ -163,23 +326,31 @@ class VideoView(QGraphicsView):
             event.ignore()
             return
 
-        factor = 1.15 if angle > 0 else 1 / 1.15
-        new_zoom = self._zoom * factor
-        if new_zoom < self._zoom_min:
-            factor = self._zoom_min / self._zoom
-            self._zoom = self._zoom_min
-        elif new_zoom > self._zoom_max:
-            factor = self._zoom_max / self._zoom
-            self._zoom = self._zoom_max
-        else:
-            self._zoom = new_zoom
+        level = self._zoom_level
+        new_level = max(_ZOOM_MIN_LEVEL, min(_ZOOM_MAX_LEVEL, level + (1 if angle > 0 else -1)))
+        if new_level != level:
+            self._zoom_level = new_level
+            if not self._zoom_timer.isActive():
+                self._zoom_timer.start()
+        event.accept()
 
+    def _apply_pending_zoom(self) -> None:
+        """Scale once for all wheel notches received since the last applied zoom."""
+        level = self._applied_zoom_level
+        new_level = self._zoom_level
+        if new_level == level:
+            return
+        factor = _ZOOM_TABLE[new_level - _ZOOM_MIN_LEVEL] / _ZOOM_TABLE[level - _ZOOM_MIN_LEVEL]
+        self._applied_zoom_level = new_level
         self.scale(factor, factor)
-        event.accept()
+        self._last_preview_end = None
+        self._point_overlay.set_view_scale(self.transform().m11())
 
     def mousePressEvent(self, event) -> None:
+        # A click can add a vertex, so the next preview must redraw even without movement
+        self._last_preview_end = None
         if self._hand_enabled and event.button() == Qt.LeftButton:
-            self.viewport().setCursor(Qt.ClosedHandCursor)
+            self.viewport().setCursor(self._closed_cursor)
             super().mousePressEvent(event)
             return
         
@@ -228,7 +399,9 @@ class VideoView(QGraphicsView):
                         return
                 elif len(self._angle_points) == 1:
                     # Second click - p2
-                    self._angle_points.append(QPointF(x, y))
+                    p2 = QPointF(x, y)
+                    self._angle_points.append(p2)
+                    self._set_perpendicular_axis(self._angle_points[0], p2)
                     event.accept()
                     return
                 elif len(self._angle_points) == 2:
@@ -238,7 +411,7 @@ class VideoView(QGraphicsView):
                     
                     # Apply perpendicular constraint if shift is pressed
                     if self._shift_pressed:
-                        x, y = self._project_to_perpendicular(p1, p2, x, y)
+                        x, y = self._project_to_perpendicular(x, y)
                     
                     x, y = self._clamp_to_video_bounds(x, y)
                     
@@ -273,24 +446,24 @@ class VideoView(QGraphicsView):
         super().mousePressEvent(event)
 
     def mouseMoveEvent(self, event) -> None:
+        if not self._tracking_mouse_moves():
+            # Hovering with nothing being drawn; skip the coordinate mapping
+            super().mouseMoveEvent(event)
+            return
         x, y = self._map_to_video_coords(event.pos())
         
         # Update line preview if drawing
         if self._current_tool == "line" and self._line_start_point is not None:
             if self._line_guide_enabled or self._line_is_dragging:
-                x, y = self._clamp_to_video_bounds(x, y)
-                self._update_line_preview(x, y)
+                self._queue_preview(*self._clamp_to_video_bounds(x, y))
         
         # Update angle preview if drawing
         elif self._current_tool == "angle" and len(self._angle_points) > 0:
             # Apply perpendicular constraint if shift is pressed and we have 2 points
             if self._shift_pressed and len(self._angle_points) == 2:
-                p1 = self._angle_points[0]
-                p2 = self._angle_points[1]
-                x, y = self._project_to_perpendicular(p1, p2, x, y)
+                x, y = self._project_to_perpendicular(x, y)
             
-            x, y = self._clamp_to_video_bounds(x, y)
-            self._update_angle_preview(x, y)
+            self._queue_preview(*self._clamp_to_video_bounds(x, y))
         
         # Update freehand preview if drawing
         elif self._current_tool == "freehand" and self._freehand_is_drawing:
@@ -312,9 +485,20 @@ class VideoView(QGraphicsView):
         
         super().mouseMoveEvent(event)
 
+    def _tracking_mouse_moves(self) -> bool:
+        """Whether a mouse move updates anything: a drawing in progress or the brush cursor."""
+        tool = self._current_tool
+        if tool == "line":
+            return self._line_start_point is not None
+        if tool == "angle":
+            return bool(self._angle_points)
+        if tool == "freehand":
+            return self._freehand_is_drawing
+        return tool == "brush"
+
     def mouseReleaseEvent(self, event) -> None:
         if self._hand_enabled and event.button() == Qt.LeftButton:
-            self.viewport().setCursor(Qt.OpenHandCursor)
+            self.viewport().setCursor(self._open_cursor)
             super().mouseReleaseEvent(event)
             return
         
@@ -325,9 +509,10 @@ class VideoView(QGraphicsView):
                 x, y = self._clamp_to_video_bounds(x, y)
                 
                 start = self._line_start_point
-                distance = abs(x - start.x()) + abs(y - start.y())
+                dx = x - start.x()
+                dy = y - start.y()
                 
-                if distance > 5:
+                if dx * dx + dy * dy > 25:  # Farther than 5 units, compared squared
                     # User dragged enough → create line immediately
                     self.line_completed.emit(start.x(), start.y(), x, y)
                     self._cancel_line_drawing()
@@ -374,6 +559,48 @@ class VideoView(QGraphicsView):
         # Preview will be created on next mouse move
         super().enterEvent(event)
 
+    # The base handlers run first so the scene still sees the drag; they reset the
+    # accepted flag, so the receivers' accept/ignore has to come after them
+    def dragEnterEvent(self, event) -> None:
+        super().dragEnterEvent(event)
+        self.drag_entered.emit(event)
+
+    def dragMoveEvent(self, event) -> None:
+        super().dragMoveEvent(event)
+        self.drag_entered.emit(event)
+
+    def dragLeaveEvent(self, event) -> None:
+        super().dragLeaveEvent(event)
+        self.drag_left.emit()
+
+    def dropEvent(self, event) -> None:
+        super().dropEvent(event)
+        self.dropped.emit(event)
+
+    # ==================== Preview throttling ====================
+
+    def _queue_preview(self, x: float, y: float) -> None:
+        """Remember the latest preview end point and redraw on the next timer tick."""
+        self._pending_preview = (x, y)
+        if not self._preview_timer.isActive():
+            self._preview_timer.start()
+
+    def _flush_preview(self) -> None:
+        """Redraw the active tool's preview; drawing may have finished or been cancelled meanwhile."""
+        x, y = self._pending_preview
+        last = self._last_preview_end
+        if last is not None:
+            # Zoomed out, many moves land within the same screen pixel and change nothing
+            scale = self.transform().m11()
+            if abs(x - last[0]) * scale < 0.5 and abs(y - last[1]) * scale < 0.5:
+                return
+        self._last_preview_end = (x, y)
+        if self._current_tool == "line":
+            if self._line_start_point is not None and (self._line_guide_enabled or self._line_is_dragging):
+                self._update_line_preview(x, y)
+        elif self._current_tool == "angle" and self._angle_points:
+            self._update_angle_preview(x, y)
+
     # ==================== Line methods ====================
     
     def _update_line_preview(self, end_x: float, end_y: float) -> None:
@@ -385,9 +612,7 @@ class VideoView(QGraphicsView):
         
         if self._line_preview_item is None:
             self._line_preview_item = QGraphicsLineItem()
-            pen = QPen(self._line_preview_color)
-            pen.setWidth(self._line_preview_width)
-            pen.setCosmetic(True)
+            pen = self._get_pen(self._line_preview_color, self._line_preview_width)
             self._line_preview_item.setPen(pen)
             self._line_preview_item.setZValue(101)
             self._scene.addItem(self._line_preview_item)
@@ -396,6 +621,7 @@ class VideoView(QGraphicsView):
 
     def _cancel_line_drawing(self) -> None:
         """Cancel any in-progress line drawing."""
+        self._last_preview_end = None
         self._line_start_point = None
         self._line_is_dragging = False
         if self._line_preview_item is not None:
@@ -404,118 +630,104 @@ class VideoView(QGraphicsView):
 
     # ==================== Angle methods ====================
 
-    def _project_to_perpendicular(self, p1: QPointF, p2: QPointF, x: float, y: float) -> tuple[float, float]:
-        """Project point (x, y) onto the line perpendicular to p1-p2 passing through p2."""
+    def _set_perpendicular_axis(self, p1: QPointF, p2: QPointF) -> None:
+        """Fix the shift-constraint axis once p1 and p2 are placed: through p2, perpendicular to p1-p2."""
         # Direction vector of p1-p2
         dx = p2.x() - p1.x()
         dy = p2.y() - p1.y()
         
-        # Handle degenerate case (p1 == p2)
+        # Handle degenerate case (p1 == p2): leave the cursor unconstrained
         if abs(dx) < 0.001 and abs(dy) < 0.001:
-            return x, y
-        
-        # Perpendicular direction (rotate 90 degrees)
-        perp_dx = -dy
-        perp_dy = dx
-        
-        # Normalize perpendicular vector
-        length = math.sqrt(perp_dx * perp_dx + perp_dy * perp_dy)
-        perp_dx /= length
-        perp_dy /= length
-        
-        # Vector from p2 to cursor
-        vx = x - p2.x()
-        vy = y - p2.y()
+            self._perp_axis = None
+            return
         
-        # Project onto perpendicular direction
-        dot = vx * perp_dx + vy * perp_dy
+        # Unit perpendicular direction (rotate 90 degrees)
+        length = math.hypot(dx, dy)
+        self._perp_axis = (p2.x(), p2.y(), -dy / length, dx / length)
+
+    def _project_to_perpendicular(self, x: float, y: float) -> tuple[float, float]:
+        """Project point (x, y) onto the cached perpendicular axis through p2."""
+        axis = self._perp_axis
+        if axis is None:
+            return x, y
+        ox, oy, ux, uy = axis
         
-        # Return projected point
-        return p2.x() + dot * perp_dx, p2.y() + dot * perp_dy
+        # Project the vector from p2 to the cursor onto the axis
+        dot = (x - ox) * ux + (y - oy) * uy
+        return ox + dot * ux, oy + dot * uy
+
+    def _angle_preview_line(self, index: int) -> QGraphicsLineItem:
+        """Return preview arm ``index`` (0 or 1), creating it on first use."""
+        lines = self._angle_preview_lines
+        if index < len(lines):
+            line = lines[index]
+            line.setVisible(True)
+            return line
+        line = QGraphicsLineItem()
+        line.setPen(self._angle_preview_pen)
+        line.setZValue(101)
+        self._scene.addItem(line)
+        lines.append(line)
+        return line
 
     def _update_angle_preview(self, end_x: float, end_y: float) -> None:
         """Update the angle preview lines."""
-        # Clear existing preview lines
-        for item in self._angle_preview_lines:
-            self._scene.removeItem(item)
-        self._angle_preview_lines.clear()
-        
-        if len(self._angle_points) == 0:
+        # The arms persist between moves; only their endpoints change
+        count = len(self._angle_points)
+        if count == 0:
+            for item in self._angle_preview_lines:
+                item.setVisible(False)
             return
         
-        pen = QPen(self._angle_preview_color)
-        pen.setWidth(self._angle_preview_width)
-        pen.setCosmetic(True)
-        
-        if len(self._angle_points) == 1:
+        if count == 1:
             # Drawing first line (p1 to cursor)
             p1 = self._angle_points[0]
-            line = QGraphicsLineItem(p1.x(), p1.y(), end_x, end_y)
-            line.setPen(pen)
-            line.setZValue(101)
-            self._scene.addItem(line)
-            self._angle_preview_lines.append(line)
+            self._angle_preview_line(0).setLine(p1.x(), p1.y(), end_x, end_y)
+            for item in self._angle_preview_lines[1:]:
+                item.setVisible(False)
         
-        elif len(self._angle_points) == 2:
+        elif count == 2:
             # Drawing second line (p2 to cursor), also show first line
             p1 = self._angle_points[0]
             p2 = self._angle_points[1]
             
             # First line (p1 to p2)
-            line1 = QGraphicsLineItem(p1.x(), p1.y(), p2.x(), p2.y())
-            line1.setPen(pen)
-            line1.setZValue(101)
-            self._scene.addItem(line1)
-            self._angle_preview_lines.append(line1)
+            self._angle_preview_line(0).setLine(p1.x(), p1.y(), p2.x(), p2.y())
             
             # Second line (p2 to cursor/p3)
-            line2 = QGraphicsLineItem(p2.x(), p2.y(), end_x, end_y)
-            line2.setPen(pen)
-            line2.setZValue(101)
-            self._scene.addItem(line2)
-            self._angle_preview_lines.append(line2)
+            self._angle_preview_line(1).setLine(p2.x(), p2.y(), end_x, end_y)
             
-            # Calculate and emit angle
-            angle = self._calculate_angle(p1, p2, QPointF(end_x, end_y))
-            self.angle_preview_changed.emit(angle)
+            # Calculate and emit angle; moves along the same ray leave it unchanged
+            angle = self._calculate_angle(p1, p2, end_x, end_y)
+            if angle != self._last_preview_angle:
+                self._last_preview_angle = angle
+                self.angle_preview_changed.emit(angle)
 
-    def _calculate_angle(self, p1: QPointF, p2: QPointF, p3: QPointF) -> float:
-        """Calculate the angle at p2 formed by p1-p2-p3, always returning < 180 degrees."""
+    def _calculate_angle(self, p1: QPointF, p2: QPointF, x3: float, y3: float) -> float:
+        """Calculate the angle at p2 formed by p1-p2-(x3, y3), always returning < 180 degrees."""
+        # The live end point stays as floats; no QPointF per preview update
+        x2 = p2.x()
+        y2 = p2.y()
         # Vectors from p2 to p1 and from p2 to p3
-        v1x = p1.x() - p2.x()
-        v1y = p1.y() - p2.y()
-        v2x = p3.x() - p2.x()
-        v2y = p3.y() - p2.y()
-        
-        # Calculate magnitudes
-        mag1 = math.sqrt(v1x * v1x + v1y * v1y)
-        mag2 = math.sqrt(v2x * v2x + v2y * v2y)
+        v1x = p1.x() - x2
+        v1y = p1.y() - y2
+        v2x = x3 - x2
+        v2y = y3 - y2
         
-        if mag1 < 0.001 or mag2 < 0.001:
+        if math.hypot(v1x, v1y) < 0.001 or math.hypot(v2x, v2y) < 0.001:
             return 0.0
         
-        # Calculate dot product and angle
-        dot = v1x * v2x + v1y * v2y
-        cos_angle = dot / (mag1 * mag2)
-        
-        # Clamp to avoid numerical errors
-        cos_angle = max(-1.0, min(1.0, cos_angle))
-        
-        angle_rad = math.acos(cos_angle)
-        angle_deg = math.degrees(angle_rad)
-        
-        # Ensure angle is always < 180
-        if angle_deg > 180:
-            angle_deg = 360 - angle_deg
-        
-        return angle_deg
+        # atan2(|cross|, dot) lies in [0, 180] without the acos clamp or a wrap-around fix
+        return math.degrees(math.atan2(abs(v1x * v2y - v1y * v2x), v1x * v2x + v1y * v2y))
 
     def _cancel_angle_drawing(self) -> None:
         """Cancel any in-progress angle drawing."""
+        self._last_preview_end = None
+        self._last_preview_angle = -1.0
         self._angle_points.clear()
+        self._perp_axis = None
         for item in self._angle_preview_lines:
-            self._scene.removeItem(item)
-        self._angle_preview_lines.clear()
+            item.setVisible(False)
         # Emit -1 to clear the angle display
         self.angle_preview_changed.emit(-1)
 
@@ -552,9 +764,7 @@ class VideoView(QGraphicsView):
         
         if self._freehand_preview_item is None:
             self._freehand_preview_item = QGraphicsPathItem()
-            pen = QPen(self._freehand_color)
-            pen.setWidth(self._freehand_width)
-            pen.setCosmetic(True)
+            pen = self._get_pen(self._freehand_color, self._freehand_width)
             self._freehand_preview_item.setPen(pen)
             self._freehand_preview_item.setBrush(Qt.NoBrush)
             self._freehand_preview_item.setZValue(101)
@@ -610,9 +820,7 @@ class VideoView(QGraphicsView):
         
         if self._brush_preview_item is None:
             self._brush_preview_item = QGraphicsEllipseItem(-radius, -radius, self._brush_diameter, self._brush_diameter)
-            pen = QPen(self._brush_color)
-            pen.setWidth(1)
-            pen.setCosmetic(True)
+            pen = self._get_pen(self._brush_color, 1)
             self._brush_preview_item.setPen(pen)
             self._brush_preview_item.setBrush(Qt.NoBrush)
             self._brush_preview_item.setZValue(102)
@@ -626,9 +834,7 @@ class VideoView(QGraphicsView):
         if self._brush_preview_item is not None:
             radius = self._brush_diameter / 2
             self._brush_preview_item.setRect(-radius, -radius, self._brush_diameter, self._brush_diameter)
-            pen = QPen(self._brush_color)
-            pen.setWidth(1)
-            pen.setCosmetic(True)
+            pen = self._get_pen(self._brush_color, 1)
             self._brush_preview_item.setPen(pen)
 
     def _update_brush_stroke_preview(self) -> None:
@@ -638,9 +844,7 @@ class VideoView(QGraphicsView):
         
         if self._brush_stroke_preview_item is None:
             self._brush_stroke_preview_item = QGraphicsPathItem()
-            pen = QPen(self._brush_color)
-            pen.setWidth(self._brush_width)
-            pen.setCosmetic(True)
+            pen = self._get_pen(self._brush_color, self._brush_width)
             self._brush_stroke_preview_item.setPen(pen)
             self._brush_stroke_preview_item.setBrush(Qt.NoBrush)
             self._brush_stroke_preview_item.setZValue(101)
@@ -665,143 +869,140 @@ class VideoView(QGraphicsView):
 
     # ==================== Common methods ====================
 
+    def _get_pen(self, color: QColor, width: int) -> QPen:
+        """Shared cosmetic pen (width in screen pixels at any zoom) for ``color`` and ``width``."""
+        key = (color.rgba(), width)
+        pen = self._pen_cache.get(key)
+        if pen is None:
+            pen = QPen(color)
+            pen.setWidth(width)
+            pen.setCosmetic(True)
+            self._pen_cache[key] = pen
+        return pen
+
     def _clamp_to_video_bounds(self, x: float, y: float) -> tuple[float, float]:
         """Clamp coordinates to video bounds."""
-        rect = self._video_item.boundingRect()
-        x = max(rect.left(), min(rect.right(), x))
-        y = max(rect.top(), min(rect.bottom(), y))
+        left, top, right, bottom = self._video_rect
+        # Plain comparisons instead of max/min calls; this runs on every drawing mouse move
+        x = left if x < left else (right if x > right else x)
+        y = top if y < top else (bottom if y > bottom else y)
         return x, y
 
-    def set_annotation_mode(self, enabled: bool) -> None:
-        """Enable or disable annotation mode (clicking creates annotations)."""
-        self._annotation_mode = enabled
+    def set_annotations(self, annotations: list[Annotation], force: bool = False) -> None:
+        """Update the visible annotations on the video.
 
-    def set_annotations(self, annotations: list[dict]) -> None:
-        """Update the visible annotations on the video."""
-        # Clear existing annotation graphics
-        for item in self._annotation_items:
-            self._scene.removeItem(item)
-        self._annotation_items.clear()
-        
-        self._annotations = annotations
+        The same records as last time are a no-op; pass ``force`` after editing one in place.
+        """
+        shown = tuple(annotations)
+        if shown == self._annotations and not force:
+            return
+        self._annotations = shown
         
-        # Draw new annotations
+        # Points go to the shared overlay; lines reuse pooled items instead of re-adding them
+        points: list[PointAnnotation] = []
+        lines_used = 0
+        line_drawers = self._line_drawers
         for annotation in annotations:
-            ann_type = annotation.get("type")
+            ann_type = annotation.type
             if ann_type == "point":
-                self._draw_point(annotation)
-            elif ann_type == "line":
-                self._draw_line(annotation)
-            elif ann_type == "angle":
-                self._draw_angle(annotation)
+                points.append(annotation)
+                continue
+            draw = line_drawers.get(ann_type)
+            if draw is not None:
+                lines_used = draw(annotation, lines_used)
+        self._point_overlay.set_points(points)
+        for item in self._line_items[lines_used:]:
+            item.setVisible(False)
         
         self._fix_scene_rect()
 
     def set_mask(self, mask_data: dict | None) -> None:
         """Update the visible mask on the video."""
-        # Clear existing mask
-        if self._mask_item is not None:
-            self._scene.removeItem(self._mask_item)
-            self._mask_item = None
-        
-        if mask_data is None:
-            self._fix_scene_rect()
-            return
-        
-        path = mask_data.get("path")
+        path = mask_data.get("path") if mask_data is not None else None
+        mask_item = self._mask_item
         if path is None or path.isEmpty():
+            # Keep the item for the next masked frame; hiding it is all that is needed
+            mask_item.setVisible(False)
             self._fix_scene_rect()
             return
         
         width = mask_data.get("width", 2)
-        color = mask_data.get("color", QColor("yellow"))
+        color = mask_data.get("color") or self._DEFAULT_MASK_COLOR
         
-        self._mask_item = QGraphicsPathItem(path)
-        pen = QPen(color)
-        pen.setWidth(width)
-        pen.setCosmetic(True)
-        self._mask_item.setPen(pen)
-        self._mask_item.setBrush(Qt.NoBrush)
-        self._mask_item.setZValue(100)
-        self._scene.addItem(self._mask_item)
+        mask_item.setPath(path)
+        mask_item.setPen(self._get_pen(color, width))
+        mask_item.setVisible(True)
         self._fix_scene_rect()
 
-    def _draw_point(self, annotation: dict) -> None:
-        """Draw a point annotation on the scene."""
-        x = annotation.get("x", 0)
-        y = annotation.get("y", 0)
-        size = annotation.get("size", 3)
-        color = annotation.get("color", QColor("yellow"))
-        
-        half_size = size / 2
-        ellipse = QGraphicsEllipseItem(-half_size, -half_size, size, size)
-        ellipse.setBrush(QBrush(color))
-        ellipse.setPen(QPen(Qt.NoPen))
-        ellipse.setZValue(100)
-        ellipse.setPos(x, y)
-        ellipse.setFlag(QGraphicsEllipseItem.ItemIgnoresTransformations, True)
-        
-        self._scene.addItem(ellipse)
-        self._annotation_items.append(ellipse)
-
-    def _draw_line(self, annotation: dict) -> None:
-        """Draw a line annotation on the scene."""
-        x1 = annotation.get("x1", 0)
-        y1 = annotation.get("y1", 0)
-        x2 = annotation.get("x2", 0)
-        y2 = annotation.get("y2", 0)
-        width = annotation.get("width", 2)
-        color = annotation.get("color", QColor("yellow"))
-        
-        line = QGraphicsLineItem(x1, y1, x2, y2)
-        pen = QPen(color)
-        pen.setWidth(width)
-        pen.setCosmetic(True)
-        line.setPen(pen)
+    def _line_item(self, slot: int) -> QGraphicsLineItem:
+        if slot < len(self._line_items):
+            line = self._line_items[slot]
+            line.setVisible(True)
+            return line
+        line = QGraphicsLineItem()
         line.setZValue(100)
-        
+        # Placed annotations are static; repaints under a moving preview or video blit the cache
+        line.setCacheMode(QGraphicsItem.DeviceCoordinateCache)
         self._scene.addItem(line)
-        self._annotation_items.append(line)
-
-    def _draw_angle(self, annotation: dict) -> None:
-        """Draw an angle annotation on the scene (two lines)."""
-        x1 = annotation.get("x1", 0)
-        y1 = annotation.get("y1", 0)
-        x2 = annotation.get("x2", 0)
-        y2 = annotation.get("y2", 0)
-        x3 = annotation.get("x3", 0)
-        y3 = annotation.get("y3", 0)
-        width = annotation.get("width", 2)
-        color = annotation.get("color", QColor("yellow"))
-        
-        pen = QPen(color)
-        pen.setWidth(width)
-        pen.setCosmetic(True)
+        self._line_items.append(line)
+        return line
+
+    def _draw_line(self, annotation: LineAnnotation, slot: int) -> int:
+        """Draw a line annotation into the pooled line at ``slot``; returns the next free slot."""
+        pen = self._get_pen(annotation.color, annotation.width)
+        
+        line = self._line_item(slot)
+        line.setLine(annotation.x1, annotation.y1, annotation.x2, annotation.y2)
+        line.setPen(pen)
+        return slot + 1
+
+    def _draw_angle(self, annotation: AngleAnnotation, slot: int) -> int:
+        """Draw an angle annotation (two lines) into the pooled lines from ``slot``; returns the next free slot."""
+        x2 = annotation.x2
+        y2 = annotation.y2
+        
+        pen = self._get_pen(annotation.color, annotation.width)
         
         # Line from p1 to p2
-        line1 = QGraphicsLineItem(x1, y1, x2, y2)
+        line1 = self._line_item(slot)
+        line1.setLine(annotation.x1, annotation.y1, x2, y2)
         line1.setPen(pen)
-        line1.setZValue(100)
-        self._scene.addItem(line1)
-        self._annotation_items.append(line1)
         
         # Line from p2 to p3
-        line2 = QGraphicsLineItem(x2, y2, x3, y3)
+        line2 = self._line_item(slot + 1)
+        line2.setLine(x2, y2, annotation.x3, annotation.y3)
         line2.setPen(pen)
-        line2.setZValue(100)
-        self._scene.addItem(line2)
-        self._annotation_items.append(line2)
+        return slot + 2
+
+    def _refresh_video_geometry(self, *_args) -> None:
+        """Re-read the video item's bounds and scene transform after a load or size change."""
+        rect = self._video_item.boundingRect()
+        self._video_rect = (rect.left(), rect.top(), rect.right(), rect.bottom())
+        inverse, _invertible = self._video_item.sceneTransform().inverted()
+        if inverse.isIdentity():
+            self._scene_to_video = None
+            return
+        self._scene_to_video = (
+            inverse.m11(), inverse.m21(), inverse.dx(),
+            inverse.m12(), inverse.m22(), inverse.dy(),
+        )
 
     def _map_to_video_coords(self, view_pos):
         """Convert view coordinates to video item coordinates."""
         scene_pos = self.mapToScene(view_pos)
-        video_pos = self._video_item.mapFromScene(scene_pos)
-        return video_pos.x(), video_pos.y()
+        sx = scene_pos.x()
+        sy = scene_pos.y()
+        transform = self._scene_to_video
+        if transform is None:
+            return sx, sy
+        m11, m21, dx, m12, m22, dy = transform
+        return m11 * sx + m21 * sy + dx, m12 * sx + m22 * sy + dy
 
     def _is_inside_video(self, x: float, y: float) -> bool:
         """Check if coordinates are within the video bounds."""
-        rect = self._video_item.boundingRect()
-        return rect.contains(x, y)
+        left, top, right, bottom = self._video_rect
+        # Same edge-inclusive test as QRectF.contains, which rejects an empty rect
+        return left < right and top < bottom and left <= x <= right and top <= y <= bottom
     
     def get_video_size(self) -> tuple[int, int]:
         """Get the native video dimensions (original resolution)."""